@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 import pysmaev.core
 import pysmaev.exceptions
@@ -14,22 +15,29 @@ from homeassistant.const import (
     CONF_SSL,
     CONF_USERNAME,
     CONF_VERIFY_SSL,
+    EVENT_HOMEASSISTANT_CLOSE,
     Platform,
 )
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import EntityDescription, async_generate_entity_id
 
-from .const import (
-    DOMAIN,
-    SMAEV_MEASUREMENT,
-    SMAEV_PARAMETER,
+from .auth import SmaEvChargerAuth, async_get_token_store
+from .catalogue import (
+    async_fetch_catalogue,
+    async_get_catalogue_store,
+    async_revalidate_catalogue,
+    writable_channels,
 )
-from .coordinator import SmaEvChargerCoordinator
+from .client import async_create_evcharger_session
+from .const import CONF_METRICS, DOMAIN
+from .coordinator import DEVICE_ERRORS, SmaEvChargerCoordinator
+from .metrics import async_register_metrics_view
 from .services import async_setup_services, async_unload_services
+from .sessions import async_get_session_store
+from .stats import SmaEvChargerStats
 
 PLATFORMS: list[Platform] = [
     Platform.DATETIME,
@@ -39,6 +47,15 @@ PLATFORMS: list[Platform] = [
     Platform.SWITCH,
 ]
 
+# Platforms whose entities write parameters, only set up for accounts which may
+# write at least one parameter.
+CONTROL_PLATFORMS = {
+    Platform.DATETIME,
+    Platform.NUMBER,
+    Platform.SELECT,
+    Platform.SWITCH,
+}
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -51,6 +68,8 @@ class SmaEvChargerRuntimeData:
     device_info: DeviceInfo
     coordinator: SmaEvChargerCoordinator
     channels: dict[str, list[str]]
+    writable_channels: set[str]
+    platforms: list[Platform]
 
 
 type SmaEvChargerConfigEntry = ConfigEntry[SmaEvChargerRuntimeData]
@@ -106,7 +125,7 @@ async def async_migrate_entry(
         # v1.0 → v1.1: set unique_id to device serial and migrate entity unique IDs
         protocol = "https" if entry.data[CONF_SSL] else "http"
         url = f"{protocol}://{entry.data[CONF_HOST]}"
-        session = async_get_clientsession(hass, verify_ssl=entry.data[CONF_VERIFY_SSL])
+        session = async_create_evcharger_session(entry.data[CONF_VERIFY_SSL])
         evcharger = pysmaev.core.SmaEvCharger(
             session, url, entry.data[CONF_USERNAME], entry.data[CONF_PASSWORD]
         )
@@ -124,6 +143,7 @@ async def async_migrate_entry(
             return False
         finally:
             await evcharger.close()
+            await session.close()
 
         serial: str = device_info["serial"]
         _async_migrate_entity_unique_ids(hass, entry, serial)
@@ -144,19 +164,48 @@ async def async_setup_entry(
     protocol = "https" if entry.data[CONF_SSL] else "http"
     url = f"{protocol}://{entry.data[CONF_HOST]}"
 
-    session = async_get_clientsession(hass, verify_ssl=entry.data[CONF_VERIFY_SSL])
+    # Each charger gets its own connection pool which is kept alive across polls,
+    # writes and service calls.
+    stats = SmaEvChargerStats()
+    session = async_create_evcharger_session(
+        entry.data[CONF_VERIFY_SSL], trace_configs=[stats.trace_config()]
+    )
+    entry.async_on_unload(session.close)
+
+    async def _async_close_session(event: Event) -> None:
+        """Close the connection pool when Home Assistant shuts down."""
+        await session.close()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+    )
+
     evcharger = pysmaev.core.SmaEvCharger(
         session, url, entry.data[CONF_USERNAME], entry.data[CONF_PASSWORD]
     )
 
-    try:
-        await evcharger.open()
-        smaev_device_info = await evcharger.device_info()
-    except pysmaev.exceptions.SmaEvChargerConnectionError as exc:
-        raise ConfigEntryNotReady from exc
-    except pysmaev.exceptions.SmaEvChargerAuthenticationError as exc:
-        raise ConfigEntryAuthFailed from exc
+    auth = SmaEvChargerAuth(hass, entry.entry_id, evcharger)
+    entry.async_on_unload(auth.async_close)
 
+    if TYPE_CHECKING:
+        assert entry.unique_id
+
+    # Set up from the cached catalogue right away and revalidate it once the
+    # platforms are loaded. Only a missing catalogue requires the charger to be
+    # reachable during setup.
+    store = async_get_catalogue_store(hass, entry.unique_id)
+    if (cached_catalogue := await store.async_load()) is None:
+        try:
+            catalogue = await async_fetch_catalogue(auth)
+        except pysmaev.exceptions.SmaEvChargerAuthenticationError as exc:
+            raise ConfigEntryAuthFailed from exc
+        except DEVICE_ERRORS as exc:
+            raise ConfigEntryNotReady from exc
+        await store.async_save(catalogue)
+    else:
+        catalogue = cached_catalogue
+
+    smaev_device_info = catalogue["device_info"]
     device_info = DeviceInfo(
         configuration_url=url,
         identifiers={(DOMAIN, smaev_device_info["serial"])},
@@ -167,35 +216,63 @@ async def async_setup_entry(
         sw_version=smaev_device_info["sw_version"],
     )
 
-    measurement_channels = await evcharger.get_measurement_channels()
-    parameter_channels = await evcharger.get_parameter_channels()
+    coordinator = SmaEvChargerCoordinator(hass, entry, auth, stats)
+    await coordinator.sessions.async_load()
 
-    coordinator = SmaEvChargerCoordinator(hass, entry, evcharger)
+    writable = writable_channels(catalogue)
+    platforms = [
+        platform
+        for platform in PLATFORMS
+        if writable or platform not in CONTROL_PLATFORMS
+    ]
 
     entry.runtime_data = SmaEvChargerRuntimeData(
         evcharger=evcharger,
         device_info=device_info,
         coordinator=coordinator,
-        channels={
-            SMAEV_MEASUREMENT: measurement_channels,
-            SMAEV_PARAMETER: parameter_channels,
-        },
+        channels=catalogue["channels"],
+        writable_channels=writable,
+        platforms=platforms,
     )
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await hass.config_entries.async_forward_entry_setups(entry, platforms)
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     # Register Integration-wide Services:
     async_setup_services(hass)
 
+    if entry.options.get(CONF_METRICS):
+        async_register_metrics_view(hass)
+
+    if cached_catalogue is not None:
+        entry.async_create_background_task(
+            hass,
+            async_revalidate_catalogue(hass, entry, auth, store, cached_catalogue),
+            f"{DOMAIN} revalidate catalogue {entry.entry_id}",
+        )
+
     return True
 
 
+async def _async_update_listener(
+    hass: HomeAssistant, entry: SmaEvChargerConfigEntry
+) -> None:
+    """Apply changed options without reloading the config entry."""
+    coordinator = entry.runtime_data.coordinator
+    coordinator.async_update_options(entry.options)
+    if entry.options.get(CONF_METRICS):
+        async_register_metrics_view(hass)
+    await coordinator.async_request_refresh()
+
+
 async def async_unload_entry(
     hass: HomeAssistant, entry: SmaEvChargerConfigEntry
 ) -> bool:
     """Unload a config entry."""
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        await entry.runtime_data.evcharger.close()
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        entry, entry.runtime_data.platforms
+    )
 
     if not hass.config_entries.async_loaded_entries(DOMAIN):
         # Unload services if there are no more config entries for this domain.
@@ -204,6 +281,16 @@ async def async_unload_entry(
     return unload_ok
 
 
+async def async_remove_entry(
+    hass: HomeAssistant, entry: SmaEvChargerConfigEntry
+) -> None:
+    """Remove the persisted data of a config entry."""
+    await async_get_token_store(hass, entry.entry_id).async_remove()
+    if entry.unique_id is not None:
+        await async_get_catalogue_store(hass, entry.unique_id).async_remove()
+        await async_get_session_store(hass, entry.unique_id).async_remove()
+
+
 def generate_smaev_entity_id(
     hass: HomeAssistant,
     config_entry: SmaEvChargerConfigEntry,
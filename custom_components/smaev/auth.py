@@ -0,0 +1,135 @@
+"""Token handling for the SMA EV Charger integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TypedDict
+
+from aiohttp import client_exceptions
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from pysmaev.const import TOKEN_TIMEOUT
+from pysmaev.core import SmaEvCharger
+from pysmaev.exceptions import (
+    SmaEvChargerAuthenticationError,
+    SmaEvChargerConnectionError,
+    SmaEvChargerException,
+)
+from pysmaev.helpers import JsonObjectType, expect_type
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+class StoredToken(TypedDict):
+    """Token data persisted across restarts."""
+
+    refresh_token: str
+
+
+def async_get_token_store(hass: HomeAssistant, entry_id: str) -> Store[StoredToken]:
+    """Return the store holding the token of a config entry."""
+    return Store[StoredToken](
+        hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.token", private=True
+    )
+
+
+class SmaEvChargerAuth:
+    """Keep the session of a charger authorized.
+
+    The refresh token is persisted, so restarts and reconnects use it to get
+    a new access token instead of logging in with username and password.
+    Credentials are only used if the refresh token was rejected.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, evcharger: SmaEvCharger
+    ) -> None:
+        """Initialize the token handling."""
+        self.hass = hass
+        self.evcharger = evcharger
+        self._store = async_get_token_store(hass, entry_id)
+        self._loaded = False
+        self._refresh_handle: asyncio.TimerHandle | None = None
+        self._open_lock = asyncio.Lock()
+
+    async def async_open(self) -> None:
+        """Authorize a new session with the charger if it is closed."""
+        async with self._open_lock:
+            if not self.evcharger.is_closed:
+                # Opened concurrently, e.g. by the coordinator.
+                return
+            if not self._loaded:
+                if stored := await self._store.async_load():
+                    self.evcharger.refresh_token = stored["refresh_token"]
+                self._loaded = True
+
+            await self._async_request_token()
+            self.evcharger.is_closed = False
+
+    async def async_close(self) -> None:
+        """Close the session with the charger."""
+        self._async_cancel_refresh()
+        await self.evcharger.close()
+
+    async def _async_request_token(self) -> None:
+        """Request a new token, falling back to the credentials if necessary."""
+        self._async_cancel_refresh()
+        result: JsonObjectType = {}
+        if self.evcharger.refresh_token:
+            try:
+                result = await self.evcharger.request_token(
+                    auto_refresh=False, force_credentials=False
+                )
+            except client_exceptions.ClientResponseError:
+                _LOGGER.debug("Refresh token rejected by %s", self.evcharger.url)
+        if not result:
+            try:
+                result = await self.evcharger.request_token(
+                    auto_refresh=False, force_credentials=True
+                )
+            except client_exceptions.ClientResponseError as exc:
+                raise SmaEvChargerAuthenticationError(
+                    "Could not authorize. Invalid credentials?"
+                ) from exc
+        if not result:
+            # pysmaev returns an empty result for responses which are not valid
+            # JSON, e.g. while the charger boots.
+            raise SmaEvChargerConnectionError("No token received.")
+
+        await self._store.async_save(
+            {"refresh_token": expect_type(str, result["refresh_token"])}
+        )
+        expires_in = expect_type(int, result.get("expires_in", TOKEN_TIMEOUT))
+        self._refresh_handle = self.hass.loop.call_later(
+            int(expires_in * 0.9), self._async_schedule_refresh
+        )
+
+    @callback
+    def _async_schedule_refresh(self) -> None:
+        """Refresh the access token before it expires."""
+        self._refresh_handle = None
+        self.hass.async_create_background_task(
+            self._async_refresh(), f"{DOMAIN} token refresh {self.evcharger.url}"
+        )
+
+    async def _async_refresh(self) -> None:
+        """Refresh the access token, the next update reconnects on failure."""
+        try:
+            await self._async_request_token()
+        except SmaEvChargerException:
+            _LOGGER.debug(
+                "Token refresh for %s failed", self.evcharger.url, exc_info=True
+            )
+            await self.evcharger.close()
+
+    @callback
+    def _async_cancel_refresh(self) -> None:
+        """Cancel a scheduled token refresh."""
+        if self._refresh_handle is not None:
+            self._refresh_handle.cancel()
+            self._refresh_handle = None
@@ -0,0 +1,88 @@
+"""Circuit breaker for the SMA EV Charger integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from enum import StrEnum
+
+# Keeps the backoff computation cheap for chargers offline for a long time.
+MAX_EXPONENT = 16
+
+
+class CircuitState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Back off exponentially from a charger which cannot be reached.
+
+    After a number of consecutive failures the circuit opens and requests are
+    refused until the backoff has passed. Then a single probe request is let
+    through. If it succeeds the circuit closes again, otherwise it reopens with
+    twice the backoff.
+    """
+
+    def __init__(
+        self,
+        time: Callable[[], float],
+        failure_threshold: int,
+        min_backoff: float,
+        max_backoff: float,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self._time = time
+        self.failure_threshold = failure_threshold
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.backoff = 0.0
+        self._open_until = 0.0
+
+    @property
+    def open_until(self) -> float:
+        """Return the time until which an open circuit refuses requests."""
+        return self._open_until
+
+    def retry_after(self) -> float | None:
+        """Return the seconds until requests are allowed again.
+
+        Returns None if a request may be sent. Once the backoff of an open
+        circuit has passed, the circuit changes to half open and the caller
+        gets to send the probe.
+        """
+        if self.state is CircuitState.CLOSED:
+            return None
+        remaining = self._open_until - self._time()
+        if self.state is CircuitState.OPEN and remaining <= 0:
+            self.state = CircuitState.HALF_OPEN
+            return None
+        # Only a single probe is sent while half open.
+        return max(remaining, self.min_backoff)
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.backoff = 0.0
+
+    def record_failure(self) -> float | None:
+        """Count a failed request.
+
+        Returns the backoff in seconds if the circuit opened.
+        """
+        self.failures += 1
+        if (
+            self.state is not CircuitState.HALF_OPEN
+            and self.failures < self.failure_threshold
+        ):
+            return None
+        exponent = min(self.failures - self.failure_threshold, MAX_EXPONENT)
+        self.backoff = min(self.min_backoff * 2**exponent, self.max_backoff)
+        self.state = CircuitState.OPEN
+        self._open_until = self._time() + self.backoff
+        return self.backoff
@@ -0,0 +1,163 @@
+"""Cached device catalogue of the SMA EV Charger integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, NotRequired, TypedDict, cast
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from pysmaev.exceptions import SmaEvChargerAuthenticationError
+from pysmaev.helpers import JsonArrayType, get_parameters_channel
+
+from .auth import SmaEvChargerAuth
+from .const import DOMAIN, SMAEV_MEASUREMENT, SMAEV_PARAMETER
+from .coordinator import DEVICE_ERRORS
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Value of the vendor nameplate channel of chargers made by SMA.
+SMA_VENDOR_ID = "461"
+
+# Delay before revalidating the catalogue again if the charger was unreachable.
+REVALIDATE_RETRY_DELAY = 300
+
+
+class DeviceCatalogue(TypedDict):
+    """Device info and available channels of a charger."""
+
+    device_info: dict[str, Any]
+    channels: dict[str, list[str]]
+    # Parameter channels the account may write, missing in catalogues cached
+    # by earlier versions.
+    writable_channels: NotRequired[list[str]]
+
+
+def writable_channels(catalogue: DeviceCatalogue) -> set[str]:
+    """Return the parameter channels the account may write."""
+    if "writable_channels" in catalogue:
+        return set(catalogue["writable_channels"])
+    return set(catalogue["channels"][SMAEV_PARAMETER])
+
+
+def async_get_catalogue_store(
+    hass: HomeAssistant, serial: str
+) -> Store[DeviceCatalogue]:
+    """Return the store holding the catalogue of a charger."""
+    return Store[DeviceCatalogue](hass, STORAGE_VERSION, f"{DOMAIN}.{serial}.catalogue")
+
+
+def device_info_from_parameters(parameters: JsonArrayType) -> dict[str, Any]:
+    """Return the device info from the nameplate parameter channels.
+
+    Matches SmaEvCharger.device_info, which requests all parameters itself.
+    """
+
+    def value(channel_id: str) -> Any:
+        return get_parameters_channel(parameters, channel_id)["value"]
+
+    return {
+        "name": value("Parameter.Nameplate.Location"),
+        "serial": value("Parameter.Nameplate.SerNum"),
+        "model": value("Parameter.Nameplate.ModelStr"),
+        "manufacturer": "SMA"
+        if value("Parameter.Nameplate.Vendor") == SMA_VENDOR_ID
+        else "unknown",
+        "sw_version": value("Parameter.Nameplate.PkgRev"),
+    }
+
+
+async def async_fetch_catalogue(auth: SmaEvChargerAuth) -> DeviceCatalogue:
+    """Fetch device info and available channels from the charger."""
+    await auth.async_open()
+    evcharger = auth.evcharger
+    measurement_channels, parameters = await asyncio.gather(
+        evcharger.get_measurement_channels(),
+        evcharger.request_parameters(),
+    )
+    device_info = device_info_from_parameters(parameters)
+    parameter_channels = [
+        channel
+        for component in cast(list[dict[str, Any]], parameters)
+        for channel in component["values"]
+    ]
+    return {
+        "device_info": device_info,
+        "channels": {
+            SMAEV_MEASUREMENT: measurement_channels,
+            SMAEV_PARAMETER: [channel["channelId"] for channel in parameter_channels],
+        },
+        "writable_channels": [
+            channel["channelId"]
+            for channel in parameter_channels
+            if channel.get("editable")
+        ],
+    }
+
+
+def catalogue_changed(cached: DeviceCatalogue, catalogue: DeviceCatalogue) -> bool:
+    """Return True if firmware, channels or write permissions differ."""
+    if cached["device_info"]["sw_version"] != catalogue["device_info"]["sw_version"]:
+        return True
+    if writable_channels(cached) != writable_channels(catalogue):
+        return True
+    return any(
+        set(cached["channels"][channel_type])
+        != set(catalogue["channels"][channel_type])
+        for channel_type in (SMAEV_MEASUREMENT, SMAEV_PARAMETER)
+    )
+
+
+async def async_revalidate_catalogue(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    auth: SmaEvChargerAuth,
+    store: Store[DeviceCatalogue],
+    cached: DeviceCatalogue,
+) -> None:
+    """Compare the cached catalogue with the charger and reload on changes."""
+    try:
+        catalogue = await async_fetch_catalogue(auth)
+    except SmaEvChargerAuthenticationError:
+        _LOGGER.debug(
+            "Authentication failed revalidating catalogue of %s",
+            auth.evcharger.url,
+            exc_info=True,
+        )
+        entry.async_start_reauth(hass)
+        return
+    except DEVICE_ERRORS:
+        _LOGGER.debug(
+            "Could not revalidate catalogue of %s, retrying in %s s",
+            auth.evcharger.url,
+            REVALIDATE_RETRY_DELAY,
+            exc_info=True,
+        )
+
+        @callback
+        def _async_retry(now: datetime) -> None:
+            entry.async_create_background_task(
+                hass,
+                async_revalidate_catalogue(hass, entry, auth, store, cached),
+                f"{DOMAIN} revalidate catalogue {entry.entry_id}",
+            )
+
+        entry.async_on_unload(
+            async_call_later(hass, REVALIDATE_RETRY_DELAY, _async_retry)
+        )
+        return
+
+    if catalogue == cached:
+        return
+    await store.async_save(catalogue)
+    if catalogue_changed(cached, catalogue):
+        _LOGGER.info(
+            "Firmware or channels of %s changed, reloading", auth.evcharger.url
+        )
+        hass.config_entries.async_schedule_reload(entry.entry_id)
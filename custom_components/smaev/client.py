@@ -0,0 +1,47 @@
+"""HTTP client session for the SMA EV Charger integration."""
+
+from __future__ import annotations
+
+from aiohttp import ClientSession, TCPConnector, TraceConfig
+from aiohttp.hdrs import USER_AGENT
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE, HassClientResponse
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util import ssl as ssl_util
+
+# Connections per charger: measurements and parameters are requested
+# concurrently, parameter writes and their confirmation may overlap a poll.
+CONNECTION_LIMIT = 4
+# Keep idle connections open across polls to avoid a TLS handshake per poll.
+KEEPALIVE_TIMEOUT = 30
+DNS_CACHE_TTL = 300
+
+
+def async_create_evcharger_session(
+    verify_ssl: bool, trace_configs: list[TraceConfig] | None = None
+) -> ClientSession:
+    """Create a client session with a connection pool dedicated to one charger.
+
+    The session behaves like the sessions of Home Assistant's aiohttp client
+    helper apart from the connector, which is not shared. It has to be closed
+    by the caller once it is no longer used.
+    """
+    if verify_ssl:
+        ssl_context = ssl_util.client_context(alpn_protocols=ssl_util.SSL_ALPN_HTTP11)
+    else:
+        ssl_context = ssl_util.client_context_no_verify(
+            alpn_protocols=ssl_util.SSL_ALPN_HTTP11
+        )
+    connector = TCPConnector(
+        ssl=ssl_context,
+        limit=CONNECTION_LIMIT,
+        limit_per_host=CONNECTION_LIMIT,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+    )
+    return ClientSession(
+        connector=connector,
+        headers={USER_AGENT: SERVER_SOFTWARE},
+        json_serialize=json_dumps,
+        response_class=HassClientResponse,
+        trace_configs=trace_configs,
+    )
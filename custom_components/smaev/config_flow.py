@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping
 from typing import Any
 
 import homeassistant.helpers.config_validation as cv
@@ -10,19 +11,37 @@ import pysmaev.core
 import pysmaev.exceptions
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.config_entries import ConfigFlowResult
+from homeassistant.config_entries import ConfigEntry, ConfigFlowResult, OptionsFlow
 from homeassistant.const import (
     CONF_BASE,
     CONF_HOST,
     CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
     CONF_SSL,
     CONF_USERNAME,
     CONF_VERIFY_SSL,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-
-from .const import DOMAIN
+from homeassistant.core import HomeAssistant, callback
+
+from .client import async_create_evcharger_session
+from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_IDLE_SCAN_INTERVAL,
+    CONF_METRICS,
+    CONF_PARAMETER_SCAN_INTERVAL,
+    CONF_POLL_JITTER,
+    CONF_SESSION_STATISTICS,
+    CONF_WRITE_DEBOUNCE,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_METRICS,
+    DEFAULT_PARAMETER_SCAN_INTERVAL,
+    DEFAULT_POLL_JITTER,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SESSION_STATISTICS,
+    DEFAULT_WRITE_DEBOUNCE,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,12 +55,46 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+STEP_REAUTH_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_USERNAME): str,
+        vol.Required(CONF_PASSWORD): str,
+    }
+)
+
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(
+            CONF_PARAMETER_SCAN_INTERVAL, default=DEFAULT_PARAMETER_SCAN_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(CONF_ADAPTIVE_POLLING, default=DEFAULT_ADAPTIVE_POLLING): (
+            cv.boolean
+        ),
+        vol.Optional(CONF_IDLE_SCAN_INTERVAL, default=DEFAULT_IDLE_SCAN_INTERVAL): (
+            vol.All(vol.Coerce(int), vol.Range(min=1))
+        ),
+        vol.Optional(CONF_WRITE_DEBOUNCE, default=DEFAULT_WRITE_DEBOUNCE): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=10)
+        ),
+        vol.Optional(CONF_POLL_JITTER, default=DEFAULT_POLL_JITTER): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=60)
+        ),
+        vol.Optional(CONF_METRICS, default=DEFAULT_METRICS): cv.boolean,
+        vol.Optional(
+            CONF_SESSION_STATISTICS, default=DEFAULT_SESSION_STATISTICS
+        ): cv.boolean,
+    }
+)
+
 
 async def validate_input(
     hass: HomeAssistant, data: dict[str, Any]
 ) -> tuple[dict[str, str], str | None]:
     """Validate the user input allows us to connect."""
-    session = async_get_clientsession(hass, verify_ssl=data[CONF_VERIFY_SSL])
+    session = async_create_evcharger_session(data[CONF_VERIFY_SSL])
 
     protocol = "https" if data[CONF_SSL] else "http"
     url = f"{protocol}://{data[CONF_HOST]}"
@@ -64,6 +117,7 @@ async def validate_input(
         errors[CONF_BASE] = "unknown"
 
     await evcharger.close()
+    await session.close()
     return errors, serial
 
 
@@ -76,6 +130,12 @@ class SmaEvChargerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     _config_data: dict[str, str]
     _reconfigure_data: dict[str, str]
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return SmaEvChargerOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -130,3 +190,49 @@ class SmaEvChargerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             ),
             errors=errors,
         )
+
+    async def async_step_reauth(
+        self, entry_data: Mapping[str, Any]
+    ) -> ConfigFlowResult:
+        """Handle credentials rejected by the charger."""
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Ask for new credentials."""
+        errors: dict[str, str] = {}
+        reauth_entry = self._get_reauth_entry()
+
+        if user_input is not None:
+            data = {**reauth_entry.data, **user_input}
+            errors, _ = await validate_input(self.hass, data)
+            if not errors:
+                return self.async_update_reload_and_abort(reauth_entry, data=data)
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=self.add_suggested_values_to_schema(
+                STEP_REAUTH_DATA_SCHEMA,
+                {CONF_USERNAME: reauth_entry.data[CONF_USERNAME]},
+            ),
+            errors=errors,
+        )
+
+
+class SmaEvChargerOptionsFlow(OptionsFlow):
+    """Handle the polling options of an SMA EV Charger config entry."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, self.config_entry.options
+            ),
+        )
@@ -9,6 +9,8 @@ SMAEV_DEVICE_INFO = "device_info"
 SMAEV_MEASUREMENT = "measurement"
 SMAEV_PARAMETER = "parameter"
 
+SMAEV_COMPONENT_ID = "IGULD:SELF"
+
 SMAEV_CHANNEL_ID = "channel_id"
 SMAEV_VALUE = "value"
 SMAEV_MIN_VALUE = "min"
@@ -19,6 +21,49 @@ SMAEV_VALUE_MAPPING = "value_mapping"
 SMAEV_DEFAULT_MIN = 0
 SMAEV_DEFAULT_MAX = 10000000000
 
+SMAEV_CHARGING_STATE_CHANNEL = "Measurement.Operation.EVeh.ChaStt"
+SMAEV_SESSION_ENERGY_CHANNEL = "Measurement.ChaSess.WhIn"
+SMAEV_METER_READING_CHANNEL = "Measurement.Metering.GridMs.TotWhIn.ChaSta"
+SMAEV_POWER_CHANNEL = "Measurement.Metering.GridMs.TotWIn.ChaSta"
+SMAEV_CHARGE_MODE_CHANNEL = "Measurement.Chrg.ModSw"
+
 DEFAULT_SCAN_INTERVAL = 5
+DEFAULT_PARAMETER_SCAN_INTERVAL = 60
+DEFAULT_ADAPTIVE_POLLING = False
+DEFAULT_IDLE_SCAN_INTERVAL = 120
+DEFAULT_WRITE_DEBOUNCE = 0.5
+DEFAULT_POLL_JITTER = 0
+DEFAULT_METRICS = False
+DEFAULT_SESSION_STATISTICS = False
+
+# Time to keep polling fast after a charging state change or parameter write
+# when adaptive polling is enabled.
+ADAPTIVE_FAST_POLLING_DURATION = 60
+
+# Number of finished charging sessions kept per charger.
+SESSION_HISTORY_SIZE = 100
+
+# Consecutive failed updates after which a charger is backed off from, and the
+# bounds of the exponential backoff in seconds.
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_MIN_BACKOFF = 10
+BREAKER_MAX_BACKOFF = 600
+
+# Maximum number of requests in flight to all chargers at once.
+MAX_CONCURRENT_REQUESTS = 10
+
+CONF_PARAMETER_SCAN_INTERVAL = "parameter_scan_interval"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_IDLE_SCAN_INTERVAL = "idle_scan_interval"
+CONF_WRITE_DEBOUNCE = "write_debounce"
+CONF_POLL_JITTER = "poll_jitter"
+CONF_METRICS = "metrics"
+CONF_SESSION_STATISTICS = "session_statistics"
 
 SERVICE_RESTART = "restart"
+SERVICE_SET_PARAMETERS = "set_parameters"
+SERVICE_GET_CHARGING_SESSIONS = "get_charging_sessions"
+
+ATTR_PARAMETERS = "parameters"
+ATTR_SESSIONS = "sessions"
+ATTR_LIMIT = "limit"
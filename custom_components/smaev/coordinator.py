@@ -1,63 +1,757 @@
 """DataUpdateCoordinator for the SMA EV Charger integration."""
 
+import asyncio
+import json
 import logging
-from datetime import timedelta
+import random
+from collections import Counter
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime, timedelta
+from time import perf_counter
 from typing import TYPE_CHECKING, Any, cast
 
+from aiohttp import ClientError, hdrs
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_SCAN_INTERVAL
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+from pysmaev.const import (
+    URL_MEASUREMENTS,
+    URL_PARAMETERS,
+    URL_SET_PARAMETERS,
+)
 from pysmaev.core import SmaEvCharger
-from pysmaev.exceptions import SmaEvChargerConnectionError, SmaEvChargerException
+from pysmaev.exceptions import (
+    SmaEvChargerAuthenticationError,
+    SmaEvChargerConnectionError,
+    SmaEvChargerException,
+)
+from pysmaev.helpers import JsonArrayType, JsonValueType, evchargerformat
 
+from .auth import SmaEvChargerAuth
+from .breaker import CircuitBreaker, CircuitState
 from .const import (
+    ADAPTIVE_FAST_POLLING_DURATION,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_BACKOFF,
+    BREAKER_MIN_BACKOFF,
+    CONF_ADAPTIVE_POLLING,
+    CONF_IDLE_SCAN_INTERVAL,
+    CONF_METRICS,
+    CONF_PARAMETER_SCAN_INTERVAL,
+    CONF_POLL_JITTER,
+    CONF_SESSION_STATISTICS,
+    CONF_WRITE_DEBOUNCE,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_METRICS,
+    DEFAULT_PARAMETER_SCAN_INTERVAL,
+    DEFAULT_POLL_JITTER,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SESSION_STATISTICS,
+    DEFAULT_WRITE_DEBOUNCE,
     DOMAIN,
+    SMAEV_CHARGING_STATE_CHANNEL,
+    SMAEV_COMPONENT_ID,
     SMAEV_MEASUREMENT,
     SMAEV_PARAMETER,
 )
+from .metrics import SmaEvChargerMetrics
+from .scheduler import async_get_scheduler, next_slot
+from .sessions import (
+    SESSION_CHANNELS,
+    VEHICLE_CONNECTED_STATES,
+    SmaEvChargerSessionTracker,
+)
+from .snapshot import (
+    Channel,
+    Decoder,
+    MeasurementChannel,
+    ParameterChannel,
+    SmaEvChargerSnapshot,
+)
+from .stats import (
+    ENDPOINT_MEASUREMENTS,
+    ENDPOINT_PARAMETERS,
+    ENDPOINT_SET_PARAMETERS,
+    SmaEvChargerStats,
+)
 
 if TYPE_CHECKING:
     from . import SmaEvChargerRuntimeData
 
 _LOGGER = logging.getLogger(__name__)
 
+# Errors of a request which count as a failed update. Besides the errors
+# pysmaev translates, HTTP error responses and timeouts pass through.
+REQUEST_ERRORS = (SmaEvChargerConnectionError, ClientError, TimeoutError)
+# Errors communicating with the charger.
+DEVICE_ERRORS = (SmaEvChargerException, ClientError, TimeoutError)
+
+
+def index_measurements(measurements: JsonArrayType) -> dict[str, MeasurementChannel]:
+    """Return the measurement channels indexed by their channel id."""
+    return {
+        channel["channelId"]: MeasurementChannel.from_json(channel["values"])
+        for channel in cast(list[dict[str, Any]], measurements)
+        if channel["componentId"] == SMAEV_COMPONENT_ID
+    }
+
+
+def measurements_query(channel_ids: list[str]) -> str:
+    """Return the request body to query the given measurement channels."""
+    return json.dumps(
+        [
+            {"componentId": SMAEV_COMPONENT_ID, "channelId": channel_id}
+            for channel_id in channel_ids
+        ],
+        separators=(",", ":"),
+    )
+
+
+def parameters_query(channel_ids: list[str]) -> str:
+    """Return the request body to query the given parameter channels."""
+    return json.dumps(
+        {
+            "queryItems": [
+                {"componentId": SMAEV_COMPONENT_ID, "channelId": channel_id}
+                for channel_id in channel_ids
+            ]
+        },
+        separators=(",", ":"),
+    )
+
+
+def parameters_update(values: Mapping[str, str]) -> str:
+    """Return the request body to write the given parameter values."""
+    timestamp = evchargerformat(datetime.now(tz=UTC))
+    return json.dumps(
+        {
+            "values": [
+                {"channelId": channel_id, "timestamp": timestamp, "value": value}
+                for channel_id, value in values.items()
+            ]
+        },
+        separators=(",", ":"),
+    )
+
+
+def value_confirmed(written: str, value: Any) -> bool:
+    """Return True if the value read back from the device matches the written one."""
+    if str(value) == written:
+        return True
+    try:
+        return float(str(value)) == float(written)
+    except ValueError:
+        return False
+
+
+def index_parameters(parameters: JsonArrayType) -> dict[str, ParameterChannel]:
+    """Return the parameter channels indexed by their channel id."""
+    return {
+        channel["channelId"]: ParameterChannel.from_json(channel)
+        for component in cast(list[dict[str, Any]], parameters)
+        if component["componentId"] == SMAEV_COMPONENT_ID
+        for channel in component["values"]
+    }
+
+
+@dataclass
+class PendingWrite:
+    """A parameter value waiting for the debounce window to pass."""
+
+    value: str
+    future: asyncio.Future[None]
+    timer: asyncio.TimerHandle
+
+
+class SmaEvChargerCoordinator(DataUpdateCoordinator[SmaEvChargerSnapshot]):
+    """SmaEvCharger coordinator.
+
+    The coordinator data is a snapshot of the measurement and parameter
+    channels indexed by their channel id. Only channels registered by entities
+    are requested from the device. The channels are decoded once per update
+    with the decoders of the entities, a decoder only runs again once the value
+    of its channel changed.
+
+    Measurements are fetched on every update. Parameters rarely change and are
+    only fetched once the parameter interval has elapsed or when a refresh of
+    the parameters was requested explicitly (e.g. after writing a parameter).
+
+    With adaptive polling enabled, the update interval is stretched to the idle
+    interval while no vehicle is connected. After a change of the charging state
+    or a parameter write the coordinator falls back to fast polling for a while.
 
-class SmaEvChargerCoordinator(DataUpdateCoordinator):
-    """SmaEvCharger coordinator."""
+    Debounced parameter writes are coalesced per channel, only the last value
+    set within the debounce window is written to the device.
+
+    Updates are scheduled in the slot assigned by the domain wide scheduler,
+    optionally delayed by a random jitter. If the device cannot be reached
+    repeatedly, a circuit breaker backs off exponentially and probes the device
+    before returning to the regular interval.
+
+    With session statistics enabled, the charging sessions and the meter reading
+    are tracked with every update and imported into the recorder statistics.
+
+    Requests, refreshes and entity updates are recorded in the statistics of
+    the charger, cumulative metrics only if enabled in the options.
+    """
 
     evcharger: SmaEvCharger
+    scan_interval: timedelta
+    parameter_update_interval: timedelta
+    adaptive_polling: bool
+    idle_update_interval: timedelta
+    write_debounce: float
+    poll_jitter: float
+    session_statistics: bool
 
     def __init__(
-        self, hass: HomeAssistant, entry: ConfigEntry, evcharger: SmaEvCharger
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        auth: SmaEvChargerAuth,
+        stats: SmaEvChargerStats,
     ) -> None:
         """Initialize the coordinator."""
         interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
         super().__init__(
             hass, _LOGGER, name="smaev", update_interval=timedelta(seconds=interval)
         )
-        self.evcharger = evcharger
+        self.auth = auth
+        self.evcharger = auth.evcharger
+        self.stats = stats
+        self._parameters_updated: float | None = None
+        self._channel_ids: dict[str, Counter[str]] = {
+            SMAEV_MEASUREMENT: Counter(),
+            SMAEV_PARAMETER: Counter(),
+        }
+        self._queries: dict[str, str] = {}
+        self._decoders: dict[tuple[str, str], list[Decoder]] = {}
+        self._decoded: dict[Decoder, tuple[Channel, Any]] = {}
+        self._charging_state: int | None = None
+        self._fast_polling_until = 0.0
+        self._unregister_charging_state: Callable[[], None] | None = None
+        self.sessions = SmaEvChargerSessionTracker(hass, entry)
+        self._session_tracking = 0
+        self._untrack_sessions: Callable[[], None] | None = None
+        self._pending_writes: dict[str, PendingWrite] = {}
+        self._entry_id = entry.entry_id
+        self.scheduler = async_get_scheduler(hass)
+        self._unregister_slot = self.scheduler.async_register(entry.entry_id)
+        self._unsub_slot: Callable[[], None] | None = None
+        self.breaker = CircuitBreaker(
+            hass.loop.time,
+            BREAKER_FAILURE_THRESHOLD,
+            BREAKER_MIN_BACKOFF,
+            BREAKER_MAX_BACKOFF,
+        )
+        self.async_update_options(entry.options)
 
-    async def _async_update_data(self) -> dict[Any, Any]:
-        """Fetch data from SmaEvCharger."""
-        if self.evcharger.is_closed:
+    @callback
+    def async_update_options(self, options: Mapping[str, Any]) -> None:
+        """Apply the polling options of the config entry."""
+        self.scan_interval = timedelta(
+            seconds=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        )
+        self.parameter_update_interval = timedelta(
+            seconds=options.get(
+                CONF_PARAMETER_SCAN_INTERVAL, DEFAULT_PARAMETER_SCAN_INTERVAL
+            )
+        )
+        self.idle_update_interval = timedelta(
+            seconds=options.get(CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL)
+        )
+        self.adaptive_polling = options.get(
+            CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+        )
+        self.write_debounce = options.get(CONF_WRITE_DEBOUNCE, DEFAULT_WRITE_DEBOUNCE)
+        self.poll_jitter = options.get(CONF_POLL_JITTER, DEFAULT_POLL_JITTER)
+        if not options.get(CONF_METRICS, DEFAULT_METRICS):
+            self.stats.metrics = None
+        elif self.stats.metrics is None:
+            self.stats.metrics = SmaEvChargerMetrics()
+        if self.adaptive_polling and self._unregister_charging_state is None:
+            # The charging state is needed even if its sensor is disabled.
+            self._unregister_charging_state = self.async_register_channel(
+                SMAEV_MEASUREMENT, SMAEV_CHARGING_STATE_CHANNEL
+            )
+        elif not self.adaptive_polling and self._unregister_charging_state:
+            self._unregister_charging_state()
+            self._unregister_charging_state = None
+        self.session_statistics = options.get(
+            CONF_SESSION_STATISTICS, DEFAULT_SESSION_STATISTICS
+        )
+        self.sessions.import_statistics = self.session_statistics
+        if self.session_statistics and not self._untrack_sessions:
+            # The sessions are needed even if the last session sensor is disabled.
+            self._untrack_sessions = self.async_track_sessions()
+        elif not self.session_statistics and self._untrack_sessions:
+            self._untrack_sessions()
+            self._untrack_sessions = None
+        self._async_adapt_update_interval()
+
+    @callback
+    def async_register_channel(
+        self, channel_type: str, channel_id: str, decoder: Decoder | None = None
+    ) -> Callable[[], None]:
+        """Register a channel to be requested from the device.
+
+        The optional decoder converts the channel to the value used by an
+        entity, see SmaEvChargerSnapshot.decoded. Returns a callback which
+        unregisters the channel again.
+        """
+        channel_ids = self._channel_ids[channel_type]
+        if channel_id not in channel_ids:
+            self._queries.pop(channel_type, None)
+            if channel_type == SMAEV_PARAMETER:
+                self._parameters_updated = None
+        channel_ids[channel_id] += 1
+        if decoder is not None:
+            self._decoders.setdefault((channel_type, channel_id), []).append(decoder)
+            if self.data is not None and (
+                channel := self.data.channels(channel_type).get(channel_id)
+            ):
+                self._async_decode_channel(self.data, decoder, channel)
+
+        @callback
+        def _async_unregister_channel() -> None:
+            channel_ids[channel_id] -= 1
+            if channel_ids[channel_id] <= 0:
+                del channel_ids[channel_id]
+                self._queries.pop(channel_type, None)
+            if decoder is not None:
+                self._decoders[channel_type, channel_id].remove(decoder)
+                self._decoded.pop(decoder, None)
+
+        return _async_unregister_channel
+
+    @callback
+    def async_track_sessions(self) -> Callable[[], None]:
+        """Track the charging sessions with the updates.
+
+        The session channels are requested from the device until the returned
+        callback is called.
+        """
+        unregister_channels = [
+            self.async_register_channel(SMAEV_MEASUREMENT, channel_id)
+            for channel_id in SESSION_CHANNELS
+        ]
+        self._session_tracking += 1
+
+        @callback
+        def _async_untrack_sessions() -> None:
+            self._session_tracking -= 1
+            for unregister in unregister_channels:
+                unregister()
+
+        return _async_untrack_sessions
+
+    @property
+    def parameters_due(self) -> bool:
+        """Return True if the parameters have to be fetched with the next update."""
+        if self.data is None or self._parameters_updated is None:
+            return True
+        return (
+            self.hass.loop.time() - self._parameters_updated
+            >= self.parameter_update_interval.total_seconds()
+        )
+
+    async def async_set_parameter(self, channel_id: str, value: str) -> None:
+        """Write a single parameter to the device."""
+        await self.async_set_parameters({channel_id: value})
+
+    async def async_set_parameter_debounced(self, channel_id: str, value: str) -> None:
+        """Write a single parameter to the device once the debounce window passed.
+
+        Values set for the same channel within the window replace each other,
+        only the last one is written. All callers return once it was written.
+        """
+        if self.write_debounce <= 0:
+            await self.async_set_parameter(channel_id, value)
+            return
+        if (pending := self._pending_writes.get(channel_id)) is None:
+            pending = PendingWrite(
+                value,
+                self.hass.loop.create_future(),
+                self.hass.loop.call_later(
+                    self.write_debounce, self._async_flush_write, channel_id
+                ),
+            )
+            self._pending_writes[channel_id] = pending
+        else:
+            _LOGGER.debug("Coalescing write of %s to %s", channel_id, value)
+            pending.value = value
+        # A cancelled caller must not cancel the write of the others.
+        await asyncio.shield(pending.future)
+
+    @callback
+    def _async_flush_write(self, channel_id: str) -> None:
+        """Write the pending value of a channel once its window passed."""
+        pending = self._pending_writes.pop(channel_id)
+        self.hass.async_create_task(
+            self._async_write_pending(channel_id, pending),
+            f"{self.name} write {channel_id}",
+        )
+
+    async def _async_write_pending(
+        self, channel_id: str, pending: PendingWrite
+    ) -> None:
+        """Write a pending value and hand the result to all its callers."""
+        try:
+            await self.async_set_parameter(channel_id, pending.value)
+        except Exception as err:
+            pending.future.set_exception(err)
+        else:
+            pending.future.set_result(None)
+
+    async def async_shutdown(self) -> None:
+        """Fail pending writes and shut down the coordinator."""
+        for pending in self._pending_writes.values():
+            pending.timer.cancel()
+            if not pending.future.done():
+                pending.future.set_exception(
+                    HomeAssistantError("Integration is shutting down")
+                )
+                # Mark the exception as retrieved in case no caller awaits it.
+                pending.future.exception()
+        self._pending_writes.clear()
+        self._unregister_slot()
+        await super().async_shutdown()
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next refresh in the update slot of the charger.
+
+        Replaces the scheduling of the base class, which refreshes one update
+        interval after the last refresh.
+        """
+        if self.update_interval is None:
+            return
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+        self._async_unsub_refresh()
+        self._unsub_slot = self.hass.loop.call_at(
+            self.next_refresh(), self._async_handle_slot
+        ).cancel
+
+    @callback
+    def _async_handle_slot(self) -> None:
+        """Refresh in the update slot of the charger.
+
+        The refresh runs as a background task like in the base class, so it
+        does not delay the startup of Home Assistant.
+        """
+        self._unsub_slot = None
+        if self.config_entry:
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._handle_refresh_interval(),
+                name=f"{self.name} - {self.config_entry.title} - refresh",
+                eager_start=True,
+            )
+        else:
+            self.hass.async_create_background_task(
+                self._handle_refresh_interval(),
+                name=f"{self.name} - refresh",
+                eager_start=True,
+            )
+
+    @callback
+    def _async_unsub_refresh(self) -> None:
+        """Cancel the scheduled refresh."""
+        if self._unsub_slot:
+            self._unsub_slot()
+            self._unsub_slot = None
+        super()._async_unsub_refresh()
+
+    def next_refresh(self) -> float:
+        """Return the loop time of the next refresh.
+
+        While the circuit breaker is open, the next refresh probes the device
+        once the backoff has passed.
+        """
+        now = self.hass.loop.time()
+        if self.breaker.state is CircuitState.OPEN:
+            return max(self.breaker.open_until, now)
+        if TYPE_CHECKING:
+            assert self.update_interval is not None
+        interval = self.update_interval.total_seconds()
+        slot = next_slot(now, interval, self.scheduler.offset(self._entry_id, interval))
+        if self.poll_jitter:
+            slot += random.uniform(0, self.poll_jitter)
+        return slot
+
+    async def async_set_parameters(
+        self, values: Mapping[str, str]
+    ) -> dict[str, bool | None]:
+        """Write several parameters to the device with a single request.
+
+        The written values are applied optimistically and confirmed afterwards
+        by reading back only the written channels. Returns for each channel if
+        the device confirmed the value, or None if it could not be read back.
+        """
+        start = perf_counter()
+        await self._async_request(
+            ENDPOINT_SET_PARAMETERS,
+            hdrs.METH_PUT,
+            f"{URL_SET_PARAMETERS}/{SMAEV_COMPONENT_ID}",
+            parameters_update(values),
+        )
+        self.async_poll_fast()
+        if self.data is not None:
+            self._async_patch_parameters(
+                {
+                    channel_id: replace(channel, value=values[channel_id])
+                    for channel_id in values
+                    if (channel := self.data.parameters.get(channel_id)) is not None
+                }
+            )
+
+        try:
+            parameters = await self._async_request(
+                ENDPOINT_PARAMETERS,
+                hdrs.METH_POST,
+                URL_PARAMETERS,
+                parameters_query(list(values)),
+            )
+        except REQUEST_ERRORS:
+            _LOGGER.debug("Could not confirm values of %s", list(values), exc_info=True)
+            parameters = None
+        if not parameters:
+            # Confirm with the next update instead.
+            self._parameters_updated = None
+            return dict.fromkeys(values)
+
+        confirmed = index_parameters(cast(JsonArrayType, parameters))
+        duration = perf_counter() - start
+        for channel_id in values:
+            if channel_id in confirmed:
+                self.stats.record_confirmation(channel_id, duration)
+        if self.data is not None:
+            self._async_patch_parameters(
+                {
+                    channel_id: channel
+                    for channel_id, channel in confirmed.items()
+                    if channel_id in self.data.parameters
+                }
+            )
+        return {
+            channel_id: channel_id in confirmed
+            and value_confirmed(value, confirmed[channel_id].value)
+            for channel_id, value in values.items()
+        }
+
+    @callback
+    def _async_decode(self, data: SmaEvChargerSnapshot) -> SmaEvChargerSnapshot:
+        """Decode the registered channels of a snapshot."""
+        for (channel_type, channel_id), decoders in self._decoders.items():
+            if (channel := data.channels(channel_type).get(channel_id)) is None:
+                continue
+            for decoder in decoders:
+                self._async_decode_channel(data, decoder, channel)
+        return data
+
+    @callback
+    def _async_decode_channel(
+        self, data: SmaEvChargerSnapshot, decoder: Decoder, channel: Channel
+    ) -> None:
+        """Decode a channel unless its value did not change since the last time."""
+        if (cached := self._decoded.get(decoder)) is None or cached[0] != channel:
             try:
-                await self.evcharger.open()
-            except SmaEvChargerException as exc:
-                raise UpdateFailed("Connection to device lost.") from exc
+                value = decoder(channel)
+            except Exception:
+                # A single undecodable channel must not fail the whole update.
+                _LOGGER.exception("Could not decode %s", channel)
+                value = None
+            cached = self._decoded[decoder] = (channel, value)
+        data.decoded[decoder] = cached[1]
+
+    @callback
+    def _async_patch_parameters(self, parameters: dict[str, ParameterChannel]) -> None:
+        """Update the given parameter channels and notify the listeners."""
+        self.data = self._async_decode(
+            replace(
+                self.data,
+                parameters={**self.data.parameters, **parameters},
+                decoded={},
+            )
+        )
+        self.async_update_listeners()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all listeners and record the entity states written."""
+        writes = self.stats.entity_writes
+        super().async_update_listeners()
+        self.stats.record_listener_update(self.stats.entity_writes - writes)
+
+    @property
+    def vehicle_connected(self) -> bool:
+        """Return True if a vehicle was connected at the last update."""
+        return self._charging_state in VEHICLE_CONNECTED_STATES
+
+    @callback
+    def async_poll_fast(self) -> None:
+        """Poll with the regular scan interval for a while."""
+        update_interval = self.update_interval
+        self._fast_polling_until = (
+            self.hass.loop.time() + ADAPTIVE_FAST_POLLING_DURATION
+        )
+        self._async_adapt_update_interval()
+        if self._unsub_slot is not None and self.update_interval != update_interval:
+            # Do not wait for the refresh scheduled with the idle interval.
+            self._schedule_refresh()
+
+    @callback
+    def _async_adapt_update_interval(self) -> None:
+        """Set the update interval according to the charging state."""
+        update_interval = self.scan_interval
+        if (
+            self.adaptive_polling
+            and self._charging_state is not None
+            and not self.vehicle_connected
+            and self.hass.loop.time() >= self._fast_polling_until
+        ):
+            update_interval = self.idle_update_interval
+        if update_interval != self.update_interval:
+            _LOGGER.debug("Polling %s every %s", self.evcharger.url, update_interval)
+            self.update_interval = update_interval
+
+    @callback
+    def _async_update_charging_state(
+        self, measurements: dict[str, MeasurementChannel]
+    ) -> None:
+        """Track the charging state and adapt the update interval to it."""
+        if (
+            channel := measurements.get(SMAEV_CHARGING_STATE_CHANNEL)
+        ) is None or channel.value is None:
+            return
+        charging_state = int(channel.value)
+        if charging_state != self._charging_state:
+            if self._charging_state is not None:
+                self.async_poll_fast()
+            self._charging_state = charging_state
+        self._async_adapt_update_interval()
+
+    async def _async_request_channels(self, channel_type: str) -> JsonArrayType:
+        """Request the registered channels of the given type from the device."""
+        if not self._channel_ids[channel_type]:
+            return []
+        if (query := self._queries.get(channel_type)) is None:
+            channel_ids = sorted(self._channel_ids[channel_type])
+            if channel_type == SMAEV_MEASUREMENT:
+                query = measurements_query(channel_ids)
+            else:
+                query = parameters_query(channel_ids)
+            self._queries[channel_type] = query
+        if channel_type == SMAEV_MEASUREMENT:
+            endpoint, url = ENDPOINT_MEASUREMENTS, URL_MEASUREMENTS
+        else:
+            endpoint, url = ENDPOINT_PARAMETERS, URL_PARAMETERS
+        async with self.scheduler.request_semaphore:
+            return cast(
+                JsonArrayType,
+                await self._async_request(endpoint, hdrs.METH_POST, url, query),
+            )
+
+    async def _async_request(
+        self, endpoint: str, method: str, url: str, data: str
+    ) -> JsonValueType:
+        """Send a request to the device and record its statistics."""
+        async with self.stats.async_time_request(endpoint):
+            return await self.evcharger.request_json(method, url, data)
 
-        data = {}
+    async def _async_fetch(
+        self, request_parameters: bool
+    ) -> tuple[JsonArrayType, JsonArrayType]:
+        """Fetch measurements and, if requested, parameters concurrently."""
+        requests = [self._async_request_channels(SMAEV_MEASUREMENT)]
+        if request_parameters:
+            requests.append(self._async_request_channels(SMAEV_PARAMETER))
+        results = await asyncio.gather(*requests, return_exceptions=True)
+
+        errors: list[Exception] = []
+        for result in results:
+            if isinstance(result, REQUEST_ERRORS):
+                errors.append(result)
+            elif isinstance(result, BaseException):
+                raise result
+        if len(errors) == 1:
+            raise UpdateFailed(errors[0]) from errors[0]
+        if errors:
+            raise UpdateFailed(
+                "; ".join(str(error) for error in errors)
+            ) from ExceptionGroup("Requests to device failed.", errors)
+
+        measurements = cast(JsonArrayType, results[0])
+        parameters = cast(JsonArrayType, results[1]) if request_parameters else []
+        return measurements, parameters
+
+    async def _async_update_data(self) -> SmaEvChargerSnapshot:
+        """Fetch data from SmaEvCharger unless the circuit breaker is open."""
+        if (retry_after := self.breaker.retry_after()) is not None:
+            raise UpdateFailed(
+                f"Backing off from unreachable device, next attempt in {retry_after:.0f} s",
+                retry_after=retry_after,
+            )
+        start = perf_counter()
         try:
-            data[SMAEV_MEASUREMENT] = await self.evcharger.request_measurements()
-            data[SMAEV_PARAMETER] = await self.evcharger.request_parameters()
-        except SmaEvChargerConnectionError as exc:
-            raise UpdateFailed(exc) from exc
+            data = await self._async_poll()
+        except UpdateFailed as err:
+            if (backoff := self.breaker.record_failure()) is not None:
+                _LOGGER.debug(
+                    "%s failed %s times, backing off for %s s",
+                    self.evcharger.url,
+                    self.breaker.failures,
+                    backoff,
+                )
+                err.retry_after = backoff
+            raise
+        finally:
+            self.stats.record_refresh(perf_counter() - start)
+        self.breaker.record_success()
+        return data
+
+    async def _async_poll(self) -> SmaEvChargerSnapshot:
+        """Poll the registered channels from the device."""
+        if self.evcharger.is_closed:
+            try:
+                await self.auth.async_open()
+            except SmaEvChargerAuthenticationError as exc:
+                raise ConfigEntryAuthFailed("Authentication failed.") from exc
+            except DEVICE_ERRORS as exc:
+                raise UpdateFailed("Connection to device lost.") from exc
 
-        if not all((data[SMAEV_MEASUREMENT], data[SMAEV_PARAMETER])):
+        request_parameters = self.parameters_due and bool(
+            self._channel_ids[SMAEV_PARAMETER]
+        )
+        measurements, parameters = await self._async_fetch(request_parameters)
+        if (self._channel_ids[SMAEV_MEASUREMENT] and not measurements) or (
+            request_parameters and not parameters
+        ):
             raise UpdateFailed("No valid data received.")
 
+        if request_parameters:
+            indexed_parameters = index_parameters(parameters)
+            self._parameters_updated = self.hass.loop.time()
+        elif self.data is not None:
+            indexed_parameters = self.data.parameters
+        else:
+            indexed_parameters = {}
+        data = self._async_decode(
+            SmaEvChargerSnapshot(index_measurements(measurements), indexed_parameters)
+        )
+
+        if self.adaptive_polling:
+            self._async_update_charging_state(data.measurements)
+        if self._session_tracking:
+            self.sessions.async_update(data.measurements, dt_util.utcnow())
+
         return data
 
 
@@ -75,7 +769,7 @@ def async_get_coordinator_by_device_id(
         if (
             entry := hass.config_entries.async_get_entry(entry_id)
         ) and entry.domain == DOMAIN:
-            runtime_data = cast(SmaEvChargerRuntimeData, entry.runtime_data)
+            runtime_data = cast("SmaEvChargerRuntimeData", entry.runtime_data)
             return runtime_data.coordinator
 
     raise ValueError(f"No coordinator for device ID: {device_id}")
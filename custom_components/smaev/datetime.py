@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING
 
 from homeassistant.components.datetime import (
     ENTITY_ID_FORMAT,
@@ -15,28 +15,23 @@ from homeassistant.components.datetime import (
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-)
-from pysmaev.helpers import get_parameters_channel
 
-from . import SmaEvChargerConfigEntry, generate_smaev_entity_id
+from . import SmaEvChargerConfigEntry
 from .const import (
     SMAEV_PARAMETER,
-    SMAEV_VALUE,
 )
-from .coordinator import SmaEvChargerCoordinator
+from .entity import SmaEvChargerEntity, SmaEvChargerEntityDescription
+from .snapshot import ParameterChannel
 
 _LOGGER = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
-class SmaEvChargerDateTimeEntityDescription(DateTimeEntityDescription):
+class SmaEvChargerDateTimeEntityDescription(
+    DateTimeEntityDescription, SmaEvChargerEntityDescription
+):
     """Describes SMA EV Charger datetime entities."""
 
-    type: str = ""
-    channel: str = ""
-
 
 DATETIME_DESCRIPTIONS: tuple[SmaEvChargerDateTimeEntityDescription] = (
     SmaEvChargerDateTimeEntityDescription(
@@ -56,7 +51,7 @@ async def async_setup_entry(
 ) -> None:
     """Set up SMA EV Charger number entities."""
     device_info = config_entry.runtime_data.device_info
-    channels = config_entry.runtime_data.channels
+    writable_channels = config_entry.runtime_data.writable_channels
 
     if TYPE_CHECKING:
         assert config_entry.unique_id
@@ -64,7 +59,7 @@ async def async_setup_entry(
     entities: list[SmaEvChargerDateTime] = []
 
     for entity_description in DATETIME_DESCRIPTIONS:
-        if entity_description.channel in channels[entity_description.type]:
+        if entity_description.channel in writable_channels:
             entities.append(
                 SmaEvChargerDateTime(
                     hass, config_entry, device_info, entity_description
@@ -79,12 +74,10 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class SmaEvChargerDateTime(CoordinatorEntity, DateTimeEntity):
+class SmaEvChargerDateTime(SmaEvChargerEntity, DateTimeEntity):
     """Representation of a SMA EV Charger datetime entity."""
 
-    coordinator: SmaEvChargerCoordinator
     entity_description: SmaEvChargerDateTimeEntityDescription
-    _attr_has_entity_name = True
 
     def __init__(
         self,
@@ -94,35 +87,23 @@ class SmaEvChargerDateTime(CoordinatorEntity, DateTimeEntity):
         entity_description: SmaEvChargerDateTimeEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(config_entry.runtime_data.coordinator)
-        self.hass = hass
-        self.entity_description = entity_description
-        self.entity_id = generate_smaev_entity_id(
-            hass, config_entry, ENTITY_ID_FORMAT, entity_description
+        super().__init__(
+            hass, config_entry, device_info, entity_description, ENTITY_ID_FORMAT
         )
-
-        self._attr_device_info = device_info
-        self._attr_unique_id = f"{config_entry.unique_id}-{self.entity_description.key}"
         self._attr_native_value = None
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        if self.coordinator.data is None:
-            return
-        channel = get_parameters_channel(
-            self.coordinator.data[SMAEV_PARAMETER],
-            self.entity_description.channel,
-        )
+    def _decode(self, channel: ParameterChannel) -> datetime:
+        """Return the timestamp of the channel as datetime."""
+        return datetime.fromtimestamp(int(channel.value), tz=UTC)
 
-        self._attr_native_value = datetime.fromtimestamp(
-            int(cast(int, channel[SMAEV_VALUE])), tz=UTC
-        )
-        super()._handle_coordinator_update()
+    @callback
+    def _async_update_attrs(self, value: datetime | None) -> None:
+        """Update the entity attributes from the decoded value."""
+        self._attr_native_value = value
 
     async def async_set_value(self, value: datetime) -> None:
         """Update to the EV charger."""
-        evcharger = self.coordinator.evcharger
         timestamp = int(value.timestamp())
-        await evcharger.set_parameter(str(timestamp), self.entity_description.channel)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_parameter(
+            self.entity_description.channel, str(timestamp)
+        )
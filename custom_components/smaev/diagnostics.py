@@ -0,0 +1,48 @@
+"""Diagnostics support for the SMA EV Charger integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from . import SmaEvChargerConfigEntry
+
+TO_REDACT = {
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    "configuration_url",
+    "hw_version",
+    "identifiers",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: SmaEvChargerConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    runtime_data = entry.runtime_data
+    coordinator = runtime_data.coordinator
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "device_info": async_redact_data(runtime_data.device_info, TO_REDACT),
+        "channels": runtime_data.channels,
+        "writable_channels": sorted(runtime_data.writable_channels),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval
+            and coordinator.update_interval.total_seconds(),
+            "breaker": {
+                "state": coordinator.breaker.state,
+                "failures": coordinator.breaker.failures,
+                "backoff": coordinator.breaker.backoff,
+            },
+        },
+        "statistics": coordinator.stats.as_dict(),
+    }
@@ -0,0 +1,141 @@
+"""Base entity for the SMA EV Charger integration."""
+
+from __future__ import annotations
+
+from abc import abstractmethod
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from . import SmaEvChargerConfigEntry, generate_smaev_entity_id
+from .coordinator import SmaEvChargerCoordinator
+from .snapshot import Decoder
+
+
+@dataclass(frozen=True)
+class SmaEvChargerEntityDescription(EntityDescription):
+    """Describes SMA EV Charger entities."""
+
+    type: str = ""
+    channel: str = ""
+
+
+class SmaEvChargerBaseEntity(CoordinatorEntity[SmaEvChargerCoordinator]):
+    """Base class for all SMA EV Charger entities.
+
+    The state is only written if the availability or the value changed since
+    the last write.
+    """
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: SmaEvChargerConfigEntry,
+        device_info: DeviceInfo,
+        entity_description: EntityDescription,
+        entity_id_format: str,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(config_entry.runtime_data.coordinator)
+        self.hass = hass
+        self.entity_description = entity_description
+        self.entity_id = generate_smaev_entity_id(
+            hass, config_entry, entity_id_format, entity_description
+        )
+
+        self._attr_device_info = device_info
+        self._attr_unique_id = f"{config_entry.unique_id}-{entity_description.key}"
+        self._written_state: tuple[bool, Any] | None = None
+
+    @property
+    @abstractmethod
+    def value(self) -> Any:
+        """Return the value the state of the entity is derived from."""
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        start = perf_counter()
+        value = self.value
+        state = (self.available, value)
+        if written := state != self._written_state:
+            self._written_state = state
+            self._async_update_attrs(value)
+            self.async_write_ha_state()
+        self.coordinator.stats.record_entity_update(perf_counter() - start, written)
+
+    @abstractmethod
+    @callback
+    def _async_update_attrs(self, value: Any) -> None:
+        """Update the entity attributes from the value.
+
+        The entity reports an unknown state if the value is None.
+        """
+
+
+class SmaEvChargerEntity(SmaEvChargerBaseEntity):
+    """Base class for SMA EV Charger entities backed by a channel.
+
+    The channel backing the entity is requested from the device as long as the
+    entity is added to hass, i.e. enabled in the entity registry. The coordinator
+    decodes the channel with the decoder of the entity whenever its value
+    changed.
+    """
+
+    entity_description: SmaEvChargerEntityDescription
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: SmaEvChargerConfigEntry,
+        device_info: DeviceInfo,
+        entity_description: SmaEvChargerEntityDescription,
+        entity_id_format: str,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(
+            hass, config_entry, device_info, entity_description, entity_id_format
+        )
+        # Keep a single bound method, the coordinator indexes decoded values by it.
+        self._decoder: Decoder = self._decode
+
+    async def async_added_to_hass(self) -> None:
+        """Register the channel of the entity when added to hass."""
+        self.async_on_remove(
+            self.coordinator.async_register_channel(
+                self.entity_description.type,
+                self.entity_description.channel,
+                self._decoder,
+            )
+        )
+        await super().async_added_to_hass()
+
+    @property
+    def value(self) -> Any:
+        """Return the value decoded from the channel backing this entity."""
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.decoded.get(self._decoder)
+
+    @abstractmethod
+    def _decode(self, channel: Any) -> Any:
+        """Return the value of the channel used by the entity.
+
+        Called by the coordinator only if the channel value changed.
+        """
+
+    @abstractmethod
+    @callback
+    def _async_update_attrs(self, value: Any) -> None:
+        """Update the entity attributes from the decoded value.
+
+        The value is None if the channel is missing or could not be decoded,
+        the entity reports an unknown state then.
+        """
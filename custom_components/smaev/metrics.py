@@ -0,0 +1,200 @@
+"""Prometheus metrics of the SMA EV Charger integration."""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from http import HTTPStatus
+
+from aiohttp import web
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.http import KEY_HASS, HomeAssistantView
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+DATA_METRICS_VIEW: HassKey[bool] = HassKey(f"{DOMAIN}_metrics_view")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Cumulative histogram of observed values."""
+
+    __slots__ = ("bucket_counts", "buckets", "count", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        """Initialize the histogram."""
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Observe a value."""
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+
+@dataclass
+class SmaEvChargerMetrics:
+    """Metrics of a single charger."""
+
+    refresh_duration: Histogram = field(
+        default_factory=lambda: Histogram(DURATION_BUCKETS)
+    )
+    request_duration: defaultdict[str, Histogram] = field(
+        default_factory=lambda: defaultdict(lambda: Histogram(DURATION_BUCKETS))
+    )
+    request_failures: Counter[str] = field(default_factory=Counter)
+    received_bytes: Counter[str] = field(default_factory=Counter)
+    json_parse_duration: defaultdict[str, Histogram] = field(
+        default_factory=lambda: defaultdict(lambda: Histogram(DURATION_BUCKETS))
+    )
+    entity_writes: Histogram = field(default_factory=lambda: Histogram(COUNT_BUCKETS))
+    confirm_duration: defaultdict[str, Histogram] = field(
+        default_factory=lambda: defaultdict(lambda: Histogram(DURATION_BUCKETS))
+    )
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _labels(labels: dict[str, str]) -> str:
+    """Format the labels of a sample."""
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def _histogram_lines(
+    name: str, labels: dict[str, str], histogram: Histogram
+) -> Iterator[str]:
+    """Return the sample lines of a histogram."""
+    for bound, count in zip(histogram.buckets, histogram.bucket_counts, strict=True):
+        yield f"{name}_bucket{{{_labels({**labels, 'le': str(bound)})}}} {count}"
+    yield f"{name}_bucket{{{_labels({**labels, 'le': '+Inf'})}}} {histogram.count}"
+    yield f"{name}_sum{{{_labels(labels)}}} {histogram.sum}"
+    yield f"{name}_count{{{_labels(labels)}}} {histogram.count}"
+
+
+def render_metrics(chargers: Iterable[tuple[str, SmaEvChargerMetrics]]) -> str:
+    """Render the metrics of the chargers, labelled by serial, as exposition text."""
+    chargers = list(chargers)
+    lines: list[str] = []
+
+    def histograms(
+        name: str,
+        description: str,
+        samples: Iterable[tuple[dict[str, str], Histogram]],
+    ) -> None:
+        lines.extend((f"# HELP {name} {description}", f"# TYPE {name} histogram"))
+        for labels, histogram in samples:
+            lines.extend(_histogram_lines(name, labels, histogram))
+
+    def counters(
+        name: str, description: str, samples: Iterable[tuple[dict[str, str], int]]
+    ) -> None:
+        lines.extend((f"# HELP {name} {description}", f"# TYPE {name} counter"))
+        lines.extend(
+            f"{name}{{{_labels(labels)}}} {value}" for labels, value in samples
+        )
+
+    histograms(
+        "smaev_refresh_duration_seconds",
+        "Duration of coordinator refreshes.",
+        (
+            ({"serial": serial}, metrics.refresh_duration)
+            for serial, metrics in chargers
+        ),
+    )
+    histograms(
+        "smaev_request_duration_seconds",
+        "Duration of requests to the charger by endpoint.",
+        (
+            ({"serial": serial, "endpoint": endpoint}, histogram)
+            for serial, metrics in chargers
+            for endpoint, histogram in metrics.request_duration.items()
+        ),
+    )
+    counters(
+        "smaev_request_failures_total",
+        "Failed requests to the charger by endpoint.",
+        (
+            ({"serial": serial, "endpoint": endpoint}, value)
+            for serial, metrics in chargers
+            for endpoint, value in metrics.request_failures.items()
+        ),
+    )
+    counters(
+        "smaev_received_bytes_total",
+        "Response bytes received from the charger by endpoint.",
+        (
+            ({"serial": serial, "endpoint": endpoint}, value)
+            for serial, metrics in chargers
+            for endpoint, value in metrics.received_bytes.items()
+        ),
+    )
+    histograms(
+        "smaev_json_parse_duration_seconds",
+        "Time from receiving a response body to the decoded result by endpoint.",
+        (
+            ({"serial": serial, "endpoint": endpoint}, histogram)
+            for serial, metrics in chargers
+            for endpoint, histogram in metrics.json_parse_duration.items()
+        ),
+    )
+    histograms(
+        "smaev_entity_writes_per_refresh",
+        "Entity states written per coordinator refresh.",
+        (({"serial": serial}, metrics.entity_writes) for serial, metrics in chargers),
+    )
+    histograms(
+        "smaev_write_confirm_duration_seconds",
+        "Time from writing a parameter until the charger confirmed it by channel.",
+        (
+            ({"serial": serial, "channel": channel}, histogram)
+            for serial, metrics in chargers
+            for channel, histogram in metrics.confirm_duration.items()
+        ),
+    )
+    return "\n".join(lines) + "\n"
+
+
+class SmaEvChargerMetricsView(HomeAssistantView):
+    """Expose the metrics of all chargers with metrics enabled."""
+
+    url = "/api/smaev/metrics"
+    name = "api:smaev:metrics"
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics in the Prometheus exposition format."""
+        hass = request.app[KEY_HASS]
+        chargers = [
+            (entry.unique_id, metrics)
+            for entry in hass.config_entries.async_loaded_entries(DOMAIN)
+            if entry.unique_id is not None
+            and (metrics := entry.runtime_data.coordinator.stats.metrics) is not None
+        ]
+        if not chargers:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+        return web.Response(
+            body=render_metrics(chargers).encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+
+@callback
+def async_register_metrics_view(hass: HomeAssistant) -> None:
+    """Register the metrics view once metrics are enabled for a charger."""
+    if hass.data.get(DATA_METRICS_VIEW) or "http" not in hass.config.components:
+        return
+    hass.http.register_view(SmaEvChargerMetricsView)
+    hass.data[DATA_METRICS_VIEW] = True
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING
 
 from homeassistant.components.number import (
     ENTITY_ID_FORMAT,
@@ -22,31 +22,28 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-)
-from pysmaev.helpers import expect_type, get_parameters_channel
 
-from . import SmaEvChargerConfigEntry, generate_smaev_entity_id
+from . import SmaEvChargerConfigEntry
 from .const import (
     SMAEV_DEFAULT_MAX,
     SMAEV_DEFAULT_MIN,
-    SMAEV_MAX_VALUE,
-    SMAEV_MIN_VALUE,
     SMAEV_PARAMETER,
-    SMAEV_VALUE,
 )
-from .coordinator import SmaEvChargerCoordinator
+from .entity import SmaEvChargerEntity, SmaEvChargerEntityDescription
+from .snapshot import ParameterChannel
 
 _LOGGER = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
-class SmaEvChargerNumberEntityDescription(NumberEntityDescription):
+class SmaEvChargerNumberEntityDescription(
+    NumberEntityDescription, SmaEvChargerEntityDescription
+):
     """Describes SMA EV Charger number entities."""
 
-    type: str = ""
-    channel: str = ""
+    # Coalesce writes of values which are adjusted frequently, e.g. by a
+    # PV surplus controller.
+    debounce_writes: bool = False
 
 
 NUMBER_DESCRIPTIONS: tuple[SmaEvChargerNumberEntityDescription, ...] = (
@@ -86,6 +83,7 @@ NUMBER_DESCRIPTIONS: tuple[SmaEvChargerNumberEntityDescription, ...] = (
         translation_key="charge_current_limit",
         type=SMAEV_PARAMETER,
         channel="Parameter.Inverter.AcALim",
+        debounce_writes=True,
         native_step=0.001,
         mode=NumberMode.BOX,
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
@@ -96,6 +94,7 @@ NUMBER_DESCRIPTIONS: tuple[SmaEvChargerNumberEntityDescription, ...] = (
         translation_key="charge_power_limit",
         type=SMAEV_PARAMETER,
         channel="Parameter.Inverter.WMaxIn",
+        debounce_writes=True,
         native_step=1,
         mode=NumberMode.BOX,
         native_unit_of_measurement=UnitOfPower.WATT,
@@ -111,7 +110,7 @@ async def async_setup_entry(
 ) -> None:
     """Set up SMA EV Charger number entities."""
     device_info = config_entry.runtime_data.device_info
-    channels = config_entry.runtime_data.channels
+    writable_channels = config_entry.runtime_data.writable_channels
 
     if TYPE_CHECKING:
         assert config_entry.unique_id
@@ -119,7 +118,7 @@ async def async_setup_entry(
     entities: list[SmaEvChargerNumber] = []
 
     for entity_description in NUMBER_DESCRIPTIONS:
-        if entity_description.channel in channels[entity_description.type]:
+        if entity_description.channel in writable_channels:
             entities.append(
                 SmaEvChargerNumber(hass, config_entry, device_info, entity_description)
             )
@@ -132,12 +131,10 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class SmaEvChargerNumber(CoordinatorEntity, NumberEntity):
+class SmaEvChargerNumber(SmaEvChargerEntity, NumberEntity):
     """Representation of a SMA EV Charger number entity."""
 
-    coordinator: SmaEvChargerCoordinator
     entity_description: SmaEvChargerNumberEntityDescription
-    _attr_has_entity_name = True
 
     def __init__(
         self,
@@ -147,58 +144,47 @@ class SmaEvChargerNumber(CoordinatorEntity, NumberEntity):
         entity_description: SmaEvChargerNumberEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(config_entry.runtime_data.coordinator)
-        self.hass = hass
-        self.config_entry = config_entry
-        self.entity_description = entity_description
-        self.entity_id = generate_smaev_entity_id(
-            hass, config_entry, ENTITY_ID_FORMAT, entity_description
+        super().__init__(
+            hass, config_entry, device_info, entity_description, ENTITY_ID_FORMAT
         )
-
-        self._attr_device_info = device_info
-        self._attr_unique_id = f"{config_entry.unique_id}-{self.entity_description.key}"
+        self.config_entry = config_entry
         self._attr_native_min_value = SMAEV_DEFAULT_MIN
         self._attr_native_max_value = SMAEV_DEFAULT_MAX
         self._attr_native_step = entity_description.native_step or 1
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        if self.coordinator.data is None:
-            return
-        channel = get_parameters_channel(
-            self.coordinator.data[SMAEV_PARAMETER],
-            self.entity_description.channel,
-        )
-
-        min_value = channel.get(SMAEV_MIN_VALUE)
-        max_value = channel.get(SMAEV_MAX_VALUE)
-        value = float(expect_type(str, channel[SMAEV_VALUE]))
+    def _decode(
+        self, channel: ParameterChannel
+    ) -> tuple[float, float | None, float | None]:
+        """Return the value and the bounds of the channel."""
+        value = float(channel.value)
         if self.native_step == 1:
             value = int(value)
-        if (
-            (min_value is not None)
-            and (max_value is not None)
-            and (
-                (min_value != self._attr_native_min_value)
-                or (max_value != self._attr_native_max_value)
-            )
-        ):
-            self._attr_native_min_value = cast(float, min_value)
-            self._attr_native_max_value = cast(float, max_value)
-            self.hass.async_create_task(self.force_refresh())
-        else:
-            self._attr_native_value = value
-        super()._handle_coordinator_update()
+        return value, channel.min, channel.max
 
-    async def force_refresh(self) -> None:
-        """Call coordinator update handle."""
-        self._handle_coordinator_update()
+    @callback
+    def _async_update_attrs(
+        self, value: tuple[float, float | None, float | None] | None
+    ) -> None:
+        """Update the entity attributes from the decoded value."""
+        if value is None:
+            self._attr_native_value = None
+            return
+        value, min_value, max_value = value
+        # Bounds and value are applied together and written in a single state.
+        if min_value is not None and max_value is not None:
+            self._attr_native_min_value = min_value
+            self._attr_native_max_value = max_value
+        self._attr_native_value = value
 
     async def async_set_native_value(self, value: float) -> None:
         """Update to the EV charger."""
         if self.native_step == 1:
             value = int(value)
-        evcharger = self.coordinator.evcharger
-        await evcharger.set_parameter(f"{value}", self.entity_description.channel)
-        await self.coordinator.async_request_refresh()
+        if self.entity_description.debounce_writes:
+            await self.coordinator.async_set_parameter_debounced(
+                self.entity_description.channel, f"{value}"
+            )
+        else:
+            await self.coordinator.async_set_parameter(
+                self.entity_description.channel, f"{value}"
+            )
@@ -0,0 +1,65 @@
+"""Domain wide update scheduling for the SMA EV Charger integration."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from collections.abc import Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, MAX_CONCURRENT_REQUESTS
+
+DATA_SCHEDULER: HassKey[SmaEvChargerScheduler] = HassKey(f"{DOMAIN}_scheduler")
+
+
+def next_slot(now: float, interval: float, offset: float) -> float:
+    """Return the time of the next update slot.
+
+    Slots repeat every interval, shifted by the offset. The next slot is the
+    first one after now, so it is at most one interval ahead.
+    """
+    return (math.floor((now - offset) / interval) + 1) * interval + offset
+
+
+class SmaEvChargerScheduler:
+    """Spread the updates of all chargers and cap the requests in flight.
+
+    Each charger gets an evenly spaced slot within its update interval, so the
+    updates of many chargers do not line up on the same tick.
+    """
+
+    def __init__(self, max_concurrent_requests: int) -> None:
+        """Initialize the scheduler."""
+        self.request_semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self._entry_ids: list[str] = []
+
+    @callback
+    def async_register(self, entry_id: str) -> Callable[[], None]:
+        """Register a charger for an update slot.
+
+        Returns a callback which releases the slot again.
+        """
+        self._entry_ids.append(entry_id)
+
+        @callback
+        def _async_unregister() -> None:
+            if entry_id in self._entry_ids:
+                self._entry_ids.remove(entry_id)
+
+        return _async_unregister
+
+    def offset(self, entry_id: str, interval: float) -> float:
+        """Return the offset of the update slots of a charger."""
+        return self._entry_ids.index(entry_id) * interval / len(self._entry_ids)
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> SmaEvChargerScheduler:
+    """Return the scheduler shared by all chargers."""
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_SCHEDULER] = SmaEvChargerScheduler(
+            MAX_CONCURRENT_REQUESTS
+        )
+    return scheduler
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.select import (
     ENTITY_ID_FORMAT,
@@ -15,29 +15,24 @@ from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-)
 from pysmaev.const import SmaEvChargerParameters
-from pysmaev.helpers import PossibleValuesType, get_parameters_channel
 
-from . import SmaEvChargerConfigEntry, generate_smaev_entity_id
+from . import SmaEvChargerConfigEntry
 from .const import (
     SMAEV_PARAMETER,
-    SMAEV_POSSIBLE_VALUES,
-    SMAEV_VALUE,
 )
-from .coordinator import SmaEvChargerCoordinator
+from .entity import SmaEvChargerEntity, SmaEvChargerEntityDescription
+from .snapshot import ParameterChannel
 
 _LOGGER = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
-class SmaEvChargerSelectEntityDescription(SelectEntityDescription):
+class SmaEvChargerSelectEntityDescription(
+    SelectEntityDescription, SmaEvChargerEntityDescription
+):
     """Describes SMA EV Charger select entities."""
 
-    type: str = ""
-    channel: str = ""
     value_mapping: dict[str, Any] = field(default_factory=dict)
 
 
@@ -78,7 +73,7 @@ async def async_setup_entry(
 ) -> None:
     """Set up SMA EV Charger select entities."""
     device_info = config_entry.runtime_data.device_info
-    channels = config_entry.runtime_data.channels
+    writable_channels = config_entry.runtime_data.writable_channels
 
     if TYPE_CHECKING:
         assert config_entry.unique_id
@@ -86,7 +81,7 @@ async def async_setup_entry(
     entities: list[SmaEvChargerSelect] = []
 
     for entity_description in SELECT_DESCRIPTIONS:
-        if entity_description.channel in channels[entity_description.type]:
+        if entity_description.channel in writable_channels:
             entities.append(
                 SmaEvChargerSelect(hass, config_entry, device_info, entity_description)
             )
@@ -99,12 +94,10 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class SmaEvChargerSelect(CoordinatorEntity, SelectEntity):
+class SmaEvChargerSelect(SmaEvChargerEntity, SelectEntity):
     """Representation of a SMA EV Charger select entity."""
 
-    coordinator: SmaEvChargerCoordinator
     entity_description: SmaEvChargerSelectEntityDescription
-    _attr_has_entity_name = True
 
     def __init__(
         self,
@@ -114,59 +107,45 @@ class SmaEvChargerSelect(CoordinatorEntity, SelectEntity):
         entity_description: SmaEvChargerSelectEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(config_entry.runtime_data.coordinator)
-        self.hass = hass
-        self.config_entry = config_entry
-        self.entity_description = entity_description
-        self.entity_id = generate_smaev_entity_id(
-            hass, config_entry, ENTITY_ID_FORMAT, entity_description
+        super().__init__(
+            hass, config_entry, device_info, entity_description, ENTITY_ID_FORMAT
         )
-
-        self._attr_device_info = device_info
-        self._attr_unique_id = f"{config_entry.unique_id}-{self.entity_description.key}"
+        self.config_entry = config_entry
         self._attr_options = []
         self._attr_current_option = None
+        self._possible_values: tuple[str, ...] | None = None
+        self._options: list[str] = []
 
         self.inv_value_mapping = {
             value: key for key, value in self.entity_description.value_mapping.items()
         }
 
+    def _decode(self, channel: ParameterChannel) -> tuple[str | None, list[str]]:
+        """Return the current option and the options of the channel.
+
+        The options are only mapped again if the possible values changed.
+        """
+        value_mapping = self.entity_description.value_mapping
+        if channel.possible_values != self._possible_values:
+            self._possible_values = channel.possible_values
+            self._options = [
+                mapped
+                for possible_value in channel.possible_values
+                if (mapped := value_mapping.get(possible_value)) is not None
+            ]
+        return value_mapping.get(channel.value), self._options
+
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        if self.coordinator.data is None:
+    def _async_update_attrs(self, value: tuple[str | None, list[str]] | None) -> None:
+        """Update the entity attributes from the decoded value."""
+        if value is None:
+            self._attr_current_option = None
             return
-        channel = get_parameters_channel(
-            self.coordinator.data[SMAEV_PARAMETER],
-            self.entity_description.channel,
-        )
-
-        possible_values = cast(
-            PossibleValuesType, channel.get(SMAEV_POSSIBLE_VALUES, [])
-        )
-        value = str(channel[SMAEV_VALUE])
-        options = [
-            mapped
-            for possible_value in possible_values
-            if (mapped := self.entity_description.value_mapping.get(possible_value))
-            is not None
-        ]
-        if options != self._attr_options:
-            self._attr_options = options
-            self.hass.async_create_task(self.force_refresh())
-        else:
-            self._attr_current_option = self.entity_description.value_mapping.get(value)
-        super()._handle_coordinator_update()
-
-    async def force_refresh(self) -> None:
-        """Call coordinator update handle."""
-        self._handle_coordinator_update()
+        # Options and current option are applied together in a single state.
+        self._attr_current_option, self._attr_options = value
 
     async def async_select_option(self, option: str) -> None:
         """Update to the EV charger."""
-        evcharger = self.coordinator.evcharger
-        await evcharger.set_parameter(
-            self.inv_value_mapping[option],
-            self.entity_description.channel,
+        await self.coordinator.async_set_parameter(
+            self.entity_description.channel, self.inv_value_mapping[option]
         )
-        await self.coordinator.async_request_refresh()
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
     ENTITY_ID_FORMAT,
@@ -24,29 +24,29 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-)
 from pysmaev.const import SmaEvChargerMeasurements
-from pysmaev.helpers import get_measurements_channel, get_parameters_channel
 
-from . import SmaEvChargerConfigEntry, generate_smaev_entity_id
+from . import SmaEvChargerConfigEntry
 from .const import (
     SMAEV_MEASUREMENT,
     SMAEV_PARAMETER,
-    SMAEV_VALUE,
 )
-from .coordinator import SmaEvChargerCoordinator
+from .entity import (
+    SmaEvChargerBaseEntity,
+    SmaEvChargerEntity,
+    SmaEvChargerEntityDescription,
+)
+from .sessions import SessionSummary
 
 _LOGGER = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
-class SmaEvChargerSensorEntityDescription(SensorEntityDescription):
+class SmaEvChargerSensorEntityDescription(
+    SensorEntityDescription, SmaEvChargerEntityDescription
+):
     """Describes SMA EV Charger sensor entities."""
 
-    type: str = ""
-    channel: str = ""
     value_mapping: dict[int | str, str] = field(default_factory=dict)
 
 
@@ -200,6 +200,14 @@ SENSOR_DESCRIPTIONS: tuple[SmaEvChargerSensorEntityDescription, ...] = (
     ),
 )
 
+LAST_SESSION_DESCRIPTION = SensorEntityDescription(
+    key="last_charging_session",
+    translation_key="last_charging_session",
+    device_class=SensorDeviceClass.TIMESTAMP,
+    # Sessions are only tracked while the sensor is enabled.
+    entity_registry_enabled_default=False,
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -213,7 +221,7 @@ async def async_setup_entry(
     if TYPE_CHECKING:
         assert config_entry.unique_id
 
-    entities: list[SmaEvChargerSensor] = []
+    entities: list[SensorEntity] = []
 
     for entity_description in SENSOR_DESCRIPTIONS:
         if entity_description.channel in channels[entity_description.type]:
@@ -226,15 +234,15 @@ async def async_setup_entry(
                 entity_description.channel,
             )
 
+    entities.append(SmaEvChargerLastSessionSensor(hass, config_entry, device_info))
+
     async_add_entities(entities)
 
 
-class SmaEvChargerSensor(CoordinatorEntity, SensorEntity):
+class SmaEvChargerSensor(SmaEvChargerEntity, SensorEntity):
     """Representation of a SMA EV Charger sensor."""
 
-    coordinator: SmaEvChargerCoordinator
     entity_description: SmaEvChargerSensorEntityDescription
-    _attr_has_entity_name = True
 
     def __init__(
         self,
@@ -244,38 +252,26 @@ class SmaEvChargerSensor(CoordinatorEntity, SensorEntity):
         entity_description: SmaEvChargerSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(config_entry.runtime_data.coordinator)
-        self.hass = hass
-        self.entity_description = entity_description
-        self.entity_id = generate_smaev_entity_id(
-            hass, config_entry, ENTITY_ID_FORMAT, entity_description
+        super().__init__(
+            hass, config_entry, device_info, entity_description, ENTITY_ID_FORMAT
         )
-
-        self._attr_device_info = device_info
-        self._attr_unique_id = f"{config_entry.unique_id}-{self.entity_description.key}"
         self._unknown_value_reported: int | str | None = None
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        value: int | str | None = None
+    def _decode(self, channel: Any) -> int | str:
+        """Return the channel value, mapped to its option if any."""
+        value: int | str
         if self.entity_description.type == SMAEV_MEASUREMENT:
-            measurements_channel = get_measurements_channel(
-                self.coordinator.data[SMAEV_MEASUREMENT],
-                self.entity_description.channel,
-            )
-            value = int(measurements_channel[0][SMAEV_VALUE])
+            value = int(channel.value)
         else:  # SMAEV_PARAMETER
-            parameters_channel = get_parameters_channel(
-                self.coordinator.data[SMAEV_PARAMETER],
-                self.entity_description.channel,
-            )
-            value = str(parameters_channel[SMAEV_VALUE])
-
-        value = self.entity_description.value_mapping.get(value) or value
+            value = channel.value
+        return self.entity_description.value_mapping.get(value) or value
 
+    @callback
+    def _async_update_attrs(self, value: int | str | None) -> None:
+        """Update the entity attributes from the decoded value."""
         if (
-            self.entity_description.device_class == SensorDeviceClass.ENUM
+            value is not None
+            and self.entity_description.device_class == SensorDeviceClass.ENUM
             and self.entity_description.options is not None
             and value not in self.entity_description.options
         ):
@@ -293,4 +289,49 @@ class SmaEvChargerSensor(CoordinatorEntity, SensorEntity):
             value = None
 
         self._attr_native_value = value
-        super()._handle_coordinator_update()
+
+
+class SmaEvChargerLastSessionSensor(SmaEvChargerBaseEntity, SensorEntity):
+    """Representation of the last charging session of a SMA EV Charger.
+
+    The state is the end of the session, its aggregates are attributes. The
+    sessions are tracked as long as the sensor is added to hass.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: SmaEvChargerConfigEntry,
+        device_info: DeviceInfo,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            hass, config_entry, device_info, LAST_SESSION_DESCRIPTION, ENTITY_ID_FORMAT
+        )
+        self._async_update_attrs(self.value)
+
+    async def async_added_to_hass(self) -> None:
+        """Track the sessions when added to hass."""
+        self.async_on_remove(self.coordinator.async_track_sessions())
+        await super().async_added_to_hass()
+
+    @property
+    def value(self) -> SessionSummary | None:
+        """Return the summary of the last finished session."""
+        return self.coordinator.sessions.last_session
+
+    @callback
+    def _async_update_attrs(self, value: SessionSummary | None) -> None:
+        """Update the entity attributes from the session summary."""
+        if value is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+        self._attr_native_value = value.end
+        self._attr_extra_state_attributes = {
+            "start": value.start,
+            "energy": value.energy,
+            "peak_power": value.peak_power,
+            "average_power": round(value.average_power, 1),
+            "charge_mode": value.charge_mode,
+        }
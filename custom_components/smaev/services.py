@@ -1,13 +1,32 @@
 """Service calls for SMA EV Charger."""
 
+from itertools import islice
+from typing import TYPE_CHECKING
+
 import voluptuous as vol
 from homeassistant.const import CONF_DEVICE_ID
-from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers import config_validation as cv
 from pysmaev.const import SmaEvChargerParameters
 
-from .const import DOMAIN, SERVICE_RESTART
-from .coordinator import async_get_coordinator_by_device_id
+from .const import (
+    ATTR_LIMIT,
+    ATTR_PARAMETERS,
+    ATTR_SESSIONS,
+    DOMAIN,
+    SERVICE_GET_CHARGING_SESSIONS,
+    SERVICE_RESTART,
+    SERVICE_SET_PARAMETERS,
+    SESSION_HISTORY_SIZE,
+)
+from .coordinator import DEVICE_ERRORS, async_get_coordinator_by_device_id
 
 SERVICE_BASE_SCHEMA = vol.Schema(
     {
@@ -17,6 +36,22 @@ SERVICE_BASE_SCHEMA = vol.Schema(
 
 SERVICE_RESTART_SCHEMA = SERVICE_BASE_SCHEMA
 
+SERVICE_SET_PARAMETERS_SCHEMA = SERVICE_BASE_SCHEMA.extend(
+    {
+        vol.Required(ATTR_PARAMETERS): vol.All(
+            {cv.string: cv.string}, vol.Length(min=1)
+        ),
+    }
+)
+
+SERVICE_GET_CHARGING_SESSIONS_SCHEMA = SERVICE_BASE_SCHEMA.extend(
+    {
+        vol.Optional(ATTR_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=SESSION_HISTORY_SIZE)
+        ),
+    }
+)
+
 
 @callback
 def async_setup_services(hass: HomeAssistant) -> None:
@@ -31,15 +66,67 @@ def async_setup_services(hass: HomeAssistant) -> None:
         channel = "Parameter.Sys.DevRstr"
         await evcharger.set_parameter(SmaEvChargerParameters.EXECUTE, channel)
 
+    async def _async_service_set_parameters(call: ServiceCall) -> ServiceResponse:
+        """Write several parameters of SMA EV Charger device at once."""
+        coordinator = async_get_coordinator_by_device_id(
+            hass, call.data[CONF_DEVICE_ID]
+        )
+        if TYPE_CHECKING:
+            assert coordinator.config_entry
+        parameters = call.data[ATTR_PARAMETERS]
+        writable = coordinator.config_entry.runtime_data.writable_channels
+        if not_writable := sorted(set(parameters) - writable):
+            raise ServiceValidationError(
+                f"Unknown or read-only parameters: {', '.join(not_writable)}"
+            )
+        try:
+            results = await coordinator.async_set_parameters(parameters)
+        except DEVICE_ERRORS as exc:
+            raise HomeAssistantError(f"Could not write parameters: {exc}") from exc
+        return {
+            ATTR_PARAMETERS: {
+                channel_id: {"success": success}
+                for channel_id, success in results.items()
+            }
+        }
+
+    async def _async_service_get_charging_sessions(
+        call: ServiceCall,
+    ) -> ServiceResponse:
+        """Return the last finished charging sessions, the latest first."""
+        coordinator = async_get_coordinator_by_device_id(
+            hass, call.data[CONF_DEVICE_ID]
+        )
+        sessions = islice(
+            reversed(coordinator.sessions.history), call.data.get(ATTR_LIMIT)
+        )
+        return {ATTR_SESSIONS: [session.as_dict() for session in sessions]}
+
     hass.services.async_register(
         DOMAIN,
         SERVICE_RESTART,
         _async_service_reset,
         schema=SERVICE_RESTART_SCHEMA,
     )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_PARAMETERS,
+        _async_service_set_parameters,
+        schema=SERVICE_SET_PARAMETERS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_CHARGING_SESSIONS,
+        _async_service_get_charging_sessions,
+        schema=SERVICE_GET_CHARGING_SESSIONS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
 
 @callback
 def async_unload_services(hass: HomeAssistant) -> None:
     """Unload services for the SMA EV Charger integration."""
     hass.services.async_remove(domain=DOMAIN, service=SERVICE_RESTART)
+    hass.services.async_remove(domain=DOMAIN, service=SERVICE_SET_PARAMETERS)
+    hass.services.async_remove(domain=DOMAIN, service=SERVICE_GET_CHARGING_SESSIONS)
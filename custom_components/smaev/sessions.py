@@ -0,0 +1,410 @@
+"""Charging session tracking of the SMA EV Charger integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    StatisticsRow,
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+from homeassistant.util.unit_conversion import EnergyConverter
+from pysmaev.const import SmaEvChargerMeasurements
+
+from .const import (
+    DOMAIN,
+    SESSION_HISTORY_SIZE,
+    SMAEV_CHARGE_MODE_CHANNEL,
+    SMAEV_CHARGING_STATE_CHANNEL,
+    SMAEV_METER_READING_CHANNEL,
+    SMAEV_POWER_CHANNEL,
+    SMAEV_SESSION_ENERGY_CHANNEL,
+)
+from .snapshot import MeasurementChannel, MeasurementValue
+
+_LOGGER = logging.getLogger(__name__)
+
+# Charging states in which a vehicle is connected to the charger.
+VEHICLE_CONNECTED_STATES = {
+    SmaEvChargerMeasurements.SLEEP_MODE,
+    SmaEvChargerMeasurements.ACTIVE_MODE,
+}
+
+# Measurement channels needed to track the charging sessions.
+SESSION_CHANNELS = (
+    SMAEV_CHARGING_STATE_CHANNEL,
+    SMAEV_SESSION_ENERGY_CHANNEL,
+    SMAEV_METER_READING_CHANNEL,
+    SMAEV_POWER_CHANNEL,
+    SMAEV_CHARGE_MODE_CHANNEL,
+)
+
+# Positions of the rotary switch, the charge mode of a session.
+CHARGE_MODES = {
+    SmaEvChargerMeasurements.SMART_CHARGING: "smart_charging",
+    SmaEvChargerMeasurements.BOOST_CHARGING: "boost_charging",
+}
+
+STORAGE_VERSION = 1
+SESSION_SAVE_DELAY = 10
+
+STATISTIC_SESSION_ENERGY = "session_energy"
+STATISTIC_CHARGED_ENERGY = "charged_energy"
+
+
+def measurement_value(
+    measurements: dict[str, MeasurementChannel], channel_id: str
+) -> MeasurementValue:
+    """Return the value of a measurement channel, None if it is missing."""
+    if (channel := measurements.get(channel_id)) is None:
+        return None
+    return channel.value
+
+
+def hour_start(moment: datetime) -> datetime:
+    """Return the start of the hour of the given moment."""
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+@dataclass(slots=True, frozen=True)
+class SessionSummary:
+    """Aggregates of a finished charging session."""
+
+    start: datetime
+    end: datetime
+    energy: float
+    peak_power: float
+    average_power: float
+    charge_mode: str | None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the summary as JSON serializable dict."""
+        return {
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "energy": self.energy,
+            "peak_power": self.peak_power,
+            "average_power": self.average_power,
+            "charge_mode": self.charge_mode,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SessionSummary:
+        """Return the summary from a dict returned by as_dict."""
+        return cls(
+            datetime.fromisoformat(data["start"]),
+            datetime.fromisoformat(data["end"]),
+            data["energy"],
+            data["peak_power"],
+            data["average_power"],
+            data["charge_mode"],
+        )
+
+
+@dataclass(slots=True)
+class ChargingSession:
+    """A running charging session, from connecting a vehicle until disconnecting.
+
+    The aggregates are updated with every update during the session, so their
+    cost does not depend on the length of the session. The average power is
+    weighted by the time each power value was measured for.
+    """
+
+    start: datetime
+    energy: float = 0.0
+    peak_power: float = 0.0
+    charge_mode: str | None = None
+    power_integral: float = 0.0
+    power: float = 0.0
+    power_updated: datetime | None = None
+
+    def update(
+        self, measurements: dict[str, MeasurementChannel], now: datetime
+    ) -> None:
+        """Aggregate the measurements of an update during the session."""
+        if (
+            energy := measurement_value(measurements, SMAEV_SESSION_ENERGY_CHANNEL)
+        ) is not None:
+            self.energy = float(energy)
+        if (power := measurement_value(measurements, SMAEV_POWER_CHANNEL)) is not None:
+            self._integrate_power(now)
+            self.power = float(power)
+            self.peak_power = max(self.peak_power, self.power)
+        if (
+            charge_mode := measurement_value(measurements, SMAEV_CHARGE_MODE_CHANNEL)
+        ) is not None:
+            self.charge_mode = CHARGE_MODES.get(int(charge_mode), self.charge_mode)
+
+    def _integrate_power(self, now: datetime) -> None:
+        """Add the last power value up to now to the power integral."""
+        if self.power_updated is not None:
+            self.power_integral += (
+                self.power * (now - self.power_updated).total_seconds()
+            )
+        self.power_updated = now
+
+    def finish(self, end: datetime) -> SessionSummary:
+        """Return the summary of the session ended at the given time."""
+        self._integrate_power(end)
+        duration = (end - self.start).total_seconds()
+        return SessionSummary(
+            start=self.start,
+            end=end,
+            energy=self.energy,
+            peak_power=self.peak_power,
+            average_power=self.power_integral / duration if duration > 0 else 0.0,
+            charge_mode=self.charge_mode,
+        )
+
+
+@callback
+def async_get_session_store(
+    hass: HomeAssistant, serial: str
+) -> Store[list[dict[str, Any]]]:
+    """Return the store holding the finished sessions of a charger."""
+    return Store[list[dict[str, Any]]](
+        hass, STORAGE_VERSION, f"{DOMAIN}.{serial}.sessions"
+    )
+
+
+class SmaEvChargerSessionTracker:
+    """Track the charging sessions of a charger.
+
+    A session starts with the first update in which a vehicle is connected and
+    ends with the first update in which it is not. A session still running when
+    Home Assistant starts is tracked from the first update on.
+
+    The summaries of the last finished sessions are kept in a store. Finished
+    sessions are imported into the session energy statistic, in the hour the
+    session ended. The meter reading of the charging station is imported into
+    the charged energy statistic once per hour. Both are external statistics of
+    the recorder, so reports read one row per hour instead of the state
+    history. Their sums continue from the last imported row. Nothing is
+    imported unless import_statistics is set and the recorder is loaded.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the session tracker."""
+        self.hass = hass
+        self.entry = entry
+        self.session: ChargingSession | None = None
+        self.history: deque[SessionSummary] = deque(maxlen=SESSION_HISTORY_SIZE)
+        self.import_statistics = False
+        if TYPE_CHECKING:
+            assert entry.unique_id
+        self._store = async_get_session_store(hass, entry.unique_id)
+        self._hour: datetime | None = None
+        self._meter_reading: float | None = None
+        self._first_meter_reading: float | None = None
+        self._imported_meter_reading: float | None = None
+        self._charged_energy_sum: float | None = None
+        self._session_hour: datetime | None = None
+        self._session_hour_energy = 0.0
+        self._session_energy_sum: float | None = None
+        self._lock = asyncio.Lock()
+        self.session_energy_metadata = self._metadata(
+            STATISTIC_SESSION_ENERGY, "session energy"
+        )
+        self.charged_energy_metadata = self._metadata(
+            STATISTIC_CHARGED_ENERGY, "charged energy"
+        )
+
+    def _metadata(self, key: str, name: str) -> StatisticMetaData:
+        """Return the metadata of an energy statistic of the charger."""
+        return StatisticMetaData(
+            mean_type=StatisticMeanType.NONE,
+            has_sum=True,
+            name=f"{self.entry.title} {name}",
+            source=DOMAIN,
+            statistic_id=f"{DOMAIN}:{slugify(f'{self.entry.unique_id}_{key}')}",
+            unit_class=EnergyConverter.UNIT_CLASS,
+            unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        )
+
+    @property
+    def last_session(self) -> SessionSummary | None:
+        """Return the summary of the last finished session."""
+        return self.history[-1] if self.history else None
+
+    async def async_load(self) -> None:
+        """Load the finished sessions from the store."""
+        if (data := await self._store.async_load()) is not None:
+            self.history.extend(SessionSummary.from_dict(session) for session in data)
+
+    @callback
+    def _async_history_data(self) -> list[dict[str, Any]]:
+        """Return the finished sessions to save."""
+        return [session.as_dict() for session in self.history]
+
+    @property
+    def recording(self) -> bool:
+        """Return True if statistics are imported."""
+        return self.import_statistics and "recorder" in self.hass.config.components
+
+    @callback
+    def async_update(
+        self, measurements: dict[str, MeasurementChannel], now: datetime
+    ) -> None:
+        """Track the sessions and the meter reading with an update."""
+        self._async_update_meter_reading(measurements, now)
+
+        if (
+            charging_state := measurement_value(
+                measurements, SMAEV_CHARGING_STATE_CHANNEL
+            )
+        ) is None:
+            return
+        connected = int(charging_state) in VEHICLE_CONNECTED_STATES
+        if connected and self.session is None:
+            self.session = ChargingSession(start=now)
+        if self.session is None:
+            return
+        if connected:
+            self.session.update(measurements, now)
+        else:
+            self._async_finish_session(self.session.finish(now))
+
+    @callback
+    def _async_finish_session(self, session: SessionSummary) -> None:
+        """Keep a finished session and import its energy."""
+        _LOGGER.debug(
+            "%s: session from %s to %s charged %s Wh",
+            self.entry.title,
+            session.start,
+            session.end,
+            session.energy,
+        )
+        self.session = None
+        self.history.append(session)
+        self._store.async_delay_save(self._async_history_data, SESSION_SAVE_DELAY)
+        if self.recording:
+            self.entry.async_create_background_task(
+                self.hass,
+                self._async_import_session(session),
+                f"{DOMAIN} import session {self.entry.entry_id}",
+            )
+
+    async def _async_import_session(self, session: SessionSummary) -> None:
+        """Import the energy of a finished session.
+
+        The row of an hour holds the energy of all sessions ended in it.
+        """
+        statistic_id = self.session_energy_metadata["statistic_id"]
+        hour = hour_start(session.end)
+        async with self._lock:
+            if self._session_energy_sum is None:
+                self._session_energy_sum = 0.0
+                if (
+                    last := await self._async_get_last_statistic(statistic_id)
+                ) is not None:
+                    self._session_energy_sum = last.get("sum") or 0.0
+                    self._session_hour = dt_util.utc_from_timestamp(last["start"])
+                    self._session_hour_energy = last.get("state") or 0.0
+            if hour != self._session_hour:
+                self._session_hour = hour
+                self._session_hour_energy = 0.0
+            self._session_hour_energy += session.energy
+            self._session_energy_sum += session.energy
+            async_add_external_statistics(
+                self.hass,
+                self.session_energy_metadata,
+                [
+                    StatisticData(
+                        start=hour,
+                        state=self._session_hour_energy,
+                        sum=self._session_energy_sum,
+                    )
+                ],
+            )
+
+    async def _async_get_last_statistic(
+        self, statistic_id: str
+    ) -> StatisticsRow | None:
+        """Return the last imported row of a statistic."""
+        last = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, statistic_id, False, {"state", "sum"}
+        )
+        if rows := last.get(statistic_id):
+            return rows[0]
+        return None
+
+    @callback
+    def _async_update_meter_reading(
+        self, measurements: dict[str, MeasurementChannel], now: datetime
+    ) -> None:
+        """Import the meter reading at the end of each hour."""
+        if (
+            meter_reading := measurement_value(
+                measurements, SMAEV_METER_READING_CHANNEL
+            )
+        ) is None:
+            return
+        hour = hour_start(now)
+        if (
+            self._hour is not None
+            and self._meter_reading is not None
+            and hour > self._hour
+            and self.recording
+        ):
+            self.entry.async_create_background_task(
+                self.hass,
+                self._async_import_meter_reading(self._hour, self._meter_reading),
+                f"{DOMAIN} import meter reading {self.entry.entry_id}",
+            )
+        self._hour = hour
+        self._meter_reading = float(meter_reading)
+        if self._first_meter_reading is None:
+            self._first_meter_reading = self._meter_reading
+
+    async def _async_import_meter_reading(
+        self, hour: datetime, meter_reading: float
+    ) -> None:
+        """Import the meter reading at the end of an hour.
+
+        The sum grows by the energy charged since the last imported reading,
+        or since the first reading if nothing was imported yet.
+        """
+        statistic_id = self.charged_energy_metadata["statistic_id"]
+        async with self._lock:
+            if self._charged_energy_sum is None:
+                self._charged_energy_sum = 0.0
+                if (
+                    last := await self._async_get_last_statistic(statistic_id)
+                ) is not None:
+                    self._charged_energy_sum = last.get("sum") or 0.0
+                    self._imported_meter_reading = last.get("state")
+            if self._imported_meter_reading is None:
+                self._imported_meter_reading = self._first_meter_reading
+            if TYPE_CHECKING:
+                assert self._imported_meter_reading is not None
+            self._charged_energy_sum += meter_reading - self._imported_meter_reading
+            self._imported_meter_reading = meter_reading
+            async_add_external_statistics(
+                self.hass,
+                self.charged_energy_metadata,
+                [
+                    StatisticData(
+                        start=hour,
+                        state=meter_reading,
+                        sum=self._charged_energy_sum,
+                    )
+                ],
+            )
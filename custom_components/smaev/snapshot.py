@@ -0,0 +1,77 @@
+"""Coordinator data snapshot of the SMA EV Charger integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from .const import (
+    SMAEV_MAX_VALUE,
+    SMAEV_MEASUREMENT,
+    SMAEV_MIN_VALUE,
+    SMAEV_POSSIBLE_VALUES,
+    SMAEV_VALUE,
+)
+
+type MeasurementValue = int | float | str | None
+
+
+@dataclass(slots=True, frozen=True)
+class MeasurementChannel:
+    """Latest value of a measurement channel."""
+
+    value: MeasurementValue
+
+    @classmethod
+    def from_json(cls, values: list[dict[str, Any]]) -> MeasurementChannel:
+        """Return the channel from the values of a measurement response."""
+        return cls(values[0].get(SMAEV_VALUE) if values else None)
+
+
+@dataclass(slots=True, frozen=True)
+class ParameterChannel:
+    """Value and bounds of a parameter channel."""
+
+    value: str
+    min: float | None = None
+    max: float | None = None
+    possible_values: tuple[str, ...] = ()
+
+    @classmethod
+    def from_json(cls, channel: dict[str, Any]) -> ParameterChannel:
+        """Return the channel from a channel of a parameter response."""
+        min_value = channel.get(SMAEV_MIN_VALUE)
+        max_value = channel.get(SMAEV_MAX_VALUE)
+        return cls(
+            str(channel.get(SMAEV_VALUE, "")),
+            None if min_value is None else float(min_value),
+            None if max_value is None else float(max_value),
+            tuple(channel.get(SMAEV_POSSIBLE_VALUES, ())),
+        )
+
+
+type Channel = MeasurementChannel | ParameterChannel
+
+# Converts a channel to the value used by an entity.
+type Decoder = Callable[[Any], Any]
+
+
+@dataclass(slots=True, frozen=True)
+class SmaEvChargerSnapshot:
+    """Channels of a charger as of the last update.
+
+    Only the fields used by the entities are kept, timestamps and other
+    metadata of the responses are dropped. The values decoded for the entities
+    are indexed by their decoder.
+    """
+
+    measurements: dict[str, MeasurementChannel]
+    parameters: dict[str, ParameterChannel]
+    decoded: dict[Decoder, Any] = field(default_factory=dict)
+
+    def channels(self, channel_type: str) -> Mapping[str, Channel]:
+        """Return the channels of the given type indexed by channel id."""
+        if channel_type == SMAEV_MEASUREMENT:
+            return self.measurements
+        return self.parameters
@@ -0,0 +1,172 @@
+"""Request and update statistics of the SMA EV Charger integration."""
+
+from __future__ import annotations
+
+import math
+from collections import defaultdict, deque
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import ClientSession, TraceConfig, TraceResponseChunkReceivedParams
+
+from .metrics import SmaEvChargerMetrics
+
+# Number of recent samples the percentiles are computed from.
+STATS_WINDOW = 200
+
+PERCENTILES = (50, 90, 99)
+
+ENDPOINT_MEASUREMENTS = "request_measurements"
+ENDPOINT_PARAMETERS = "request_parameters"
+ENDPOINT_SET_PARAMETERS = "set_parameters"
+
+
+def percentiles(samples: Iterable[float]) -> dict[str, float] | None:
+    """Return the nearest-rank percentiles of the samples."""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    return {
+        f"p{percentile}": ordered[math.ceil(percentile / 100 * len(ordered)) - 1]
+        for percentile in PERCENTILES
+    }
+
+
+def milliseconds(samples: Iterable[float], digits: int) -> dict[str, float] | None:
+    """Return the percentiles of durations in seconds as milliseconds."""
+    if (result := percentiles(samples)) is None:
+        return None
+    return {key: round(value * 1000, digits) for key, value in result.items()}
+
+
+@dataclass
+class OperationStats:
+    """Rolling statistics of an operation."""
+
+    count: int = 0
+    failures: int = 0
+    durations: deque[float] = field(default_factory=lambda: deque(maxlen=STATS_WINDOW))
+    sizes: deque[int] = field(default_factory=lambda: deque(maxlen=STATS_WINDOW))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics with the percentiles of durations and sizes."""
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "latency_ms": milliseconds(self.durations, 1),
+            "payload_bytes": percentiles(self.sizes),
+        }
+
+
+@dataclass
+class RequestRecord:
+    """Response data of the request in flight, filled in by the client trace."""
+
+    size: int | None = None
+    received: float | None = None
+
+
+_CURRENT_REQUEST: ContextVar[RequestRecord | None] = ContextVar(
+    "smaev_current_request", default=None
+)
+
+
+class SmaEvChargerStats:
+    """Statistics of the requests to a charger and of the entity updates.
+
+    Rolling statistics are always kept for diagnostics. Cumulative metrics are
+    only recorded if enabled.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.requests: defaultdict[str, OperationStats] = defaultdict(OperationStats)
+        self.entity_updates = OperationStats()
+        self.entity_writes = 0
+        self.metrics: SmaEvChargerMetrics | None = None
+
+    def trace_config(self) -> TraceConfig:
+        """Return a client trace recording the response sizes of timed requests."""
+
+        async def _on_response_chunk_received(
+            session: ClientSession,
+            context: SimpleNamespace,
+            params: TraceResponseChunkReceivedParams,
+        ) -> None:
+            if (record := _CURRENT_REQUEST.get()) is not None:
+                record.size = (record.size or 0) + len(params.chunk)
+                record.received = perf_counter()
+
+        trace_config = TraceConfig()
+        trace_config.on_response_chunk_received.append(_on_response_chunk_received)
+        return trace_config
+
+    @asynccontextmanager
+    async def async_time_request(self, endpoint: str) -> AsyncIterator[RequestRecord]:
+        """Time a request to the given endpoint and count its failures."""
+        stats = self.requests[endpoint]
+        record = RequestRecord()
+        token = _CURRENT_REQUEST.set(record)
+        start = perf_counter()
+        failed = False
+        try:
+            yield record
+        except Exception:
+            stats.failures += 1
+            failed = True
+            raise
+        finally:
+            end = perf_counter()
+            _CURRENT_REQUEST.reset(token)
+            stats.count += 1
+            stats.durations.append(end - start)
+            if record.size is not None:
+                stats.sizes.append(record.size)
+            if (metrics := self.metrics) is not None:
+                metrics.request_duration[endpoint].observe(end - start)
+                if failed:
+                    metrics.request_failures[endpoint] += 1
+                if record.size is not None:
+                    metrics.received_bytes[endpoint] += record.size
+                if record.received is not None and not failed:
+                    metrics.json_parse_duration[endpoint].observe(end - record.received)
+
+    def record_entity_update(self, duration: float, written: bool) -> None:
+        """Record the time an entity spent handling a coordinator update."""
+        self.entity_updates.count += 1
+        self.entity_updates.durations.append(duration)
+        if written:
+            self.entity_writes += 1
+
+    def record_listener_update(self, writes: int) -> None:
+        """Record the entity states written by an update of the listeners."""
+        if self.metrics is not None:
+            self.metrics.entity_writes.observe(writes)
+
+    def record_refresh(self, duration: float) -> None:
+        """Record the duration of a coordinator refresh."""
+        if self.metrics is not None:
+            self.metrics.refresh_duration.observe(duration)
+
+    def record_confirmation(self, channel_id: str, duration: float) -> None:
+        """Record the time until a written parameter was confirmed."""
+        if self.metrics is not None:
+            self.metrics.confirm_duration[channel_id].observe(duration)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics."""
+        return {
+            "requests": {
+                endpoint: stats.as_dict() for endpoint, stats in self.requests.items()
+            },
+            "entity_updates": {
+                "count": self.entity_updates.count,
+                "writes": self.entity_writes,
+                "duration_ms": milliseconds(self.entity_updates.durations, 3),
+            },
+        }
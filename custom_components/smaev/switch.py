@@ -15,28 +15,23 @@ from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-)
 from pysmaev.const import SmaEvChargerParameters
-from pysmaev.helpers import expect_type, get_parameters_channel
 
-from . import SmaEvChargerConfigEntry, generate_smaev_entity_id
+from . import SmaEvChargerConfigEntry
 from .const import (
     SMAEV_PARAMETER,
-    SMAEV_VALUE,
 )
-from .coordinator import SmaEvChargerCoordinator
+from .entity import SmaEvChargerEntity, SmaEvChargerEntityDescription
 
 _LOGGER = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
-class SmaEvChargerSwitchEntityDescription(SwitchEntityDescription):
+class SmaEvChargerSwitchEntityDescription(
+    SwitchEntityDescription, SmaEvChargerEntityDescription
+):
     """Describes SMA EV Charger switch entities."""
 
-    type: str = ""
-    channel: str = ""
     value_mapping: dict[str, Any] = field(default_factory=dict)
 
 
@@ -74,7 +69,7 @@ async def async_setup_entry(
 ) -> None:
     """Set up SMA EV Charger select entities."""
     device_info = config_entry.runtime_data.device_info
-    channels = config_entry.runtime_data.channels
+    writable_channels = config_entry.runtime_data.writable_channels
 
     if TYPE_CHECKING:
         assert config_entry.unique_id
@@ -82,7 +77,7 @@ async def async_setup_entry(
     entities: list[SmaEvChargerSwitch] = []
 
     for entity_description in SWITCH_DESCRIPTIONS:
-        if entity_description.channel in channels[entity_description.type]:
+        if entity_description.channel in writable_channels:
             entities.append(
                 SmaEvChargerSwitch(hass, config_entry, device_info, entity_description)
             )
@@ -95,12 +90,10 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class SmaEvChargerSwitch(CoordinatorEntity, SwitchEntity):
+class SmaEvChargerSwitch(SmaEvChargerEntity, SwitchEntity):
     """Representation of a SMA EV Charger switch entity."""
 
-    coordinator: SmaEvChargerCoordinator
     entity_description: SmaEvChargerSwitchEntityDescription
-    _attr_has_entity_name = True
 
     def __init__(
         self,
@@ -110,51 +103,32 @@ class SmaEvChargerSwitch(CoordinatorEntity, SwitchEntity):
         entity_description: SmaEvChargerSwitchEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(config_entry.runtime_data.coordinator)
-        self.hass = hass
-        self.entity_description = entity_description
-        self.entity_id = generate_smaev_entity_id(
-            hass, config_entry, ENTITY_ID_FORMAT, entity_description
+        super().__init__(
+            hass, config_entry, device_info, entity_description, ENTITY_ID_FORMAT
         )
-
-        self._attr_device_info = device_info
-        self._attr_unique_id = f"{config_entry.unique_id}-{self.entity_description.key}"
         self._attr_current_option = None
 
         self.inv_value_mapping = {
             value: key for key, value in self.entity_description.value_mapping.items()
         }
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        if self.coordinator.data is None:
-            return
-        channel = get_parameters_channel(
-            self.coordinator.data[SMAEV_PARAMETER],
-            self.entity_description.channel,
-        )
+    def _decode(self, channel: Any) -> Any:
+        """Return the channel value mapped to the switch state."""
+        return self.entity_description.value_mapping.get(channel.value, channel.value)
 
-        value = expect_type(str, channel[SMAEV_VALUE])
-        self._attr_is_on = self.entity_description.value_mapping.get(value, value)
-        super()._handle_coordinator_update()
+    @callback
+    def _async_update_attrs(self, value: Any) -> None:
+        """Update the entity attributes from the decoded value."""
+        self._attr_is_on = value
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Update to the EV charger."""
-        evcharger = self.coordinator.evcharger
-        await evcharger.set_parameter(
-            self.inv_value_mapping[True],
-            self.entity_description.channel,
+        await self.coordinator.async_set_parameter(
+            self.entity_description.channel, self.inv_value_mapping[True]
         )
-        self._attr_is_on = True
-        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Update to the EV charger."""
-        evcharger = self.coordinator.evcharger
-        await evcharger.set_parameter(
-            self.inv_value_mapping[False],
-            self.entity_description.channel,
+        await self.coordinator.async_set_parameter(
+            self.entity_description.channel, self.inv_value_mapping[False]
         )
-        self._attr_is_on = False
-        await self.coordinator.async_request_refresh()
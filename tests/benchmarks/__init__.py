@@ -0,0 +1 @@
+"""Benchmarks for Home Assistant SMA EV Charger."""
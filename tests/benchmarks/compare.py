@@ -0,0 +1,49 @@
+"""Compare the results of two benchmark runs.
+
+python -m tests.benchmarks.compare benchmarks/1.4.0.json benchmarks/1.5.0.json
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+
+def load(path: str) -> tuple[str, dict[tuple[int, int], dict[str, Any]]]:
+    """Return the version and the results of a run by benchmark case."""
+    run = json.loads(Path(path).read_text())
+    return run["version"], {
+        (result["chargers"], result["synthetic_channels"]): result
+        for result in run["results"]
+    }
+
+
+def compare(baseline: str, candidate: str) -> list[str]:
+    """Return the table of the median round durations of both runs."""
+    baseline_version, baseline_results = load(baseline)
+    candidate_version, candidate_results = load(candidate)
+    lines = [
+        f"{'chargers':>8} {'channels':>8} {baseline_version:>12} "
+        f"{candidate_version:>12} {'change':>8}"
+    ]
+    for case in sorted(baseline_results.keys() & candidate_results.keys()):
+        before = baseline_results[case]["round_ms"]["p50"]
+        after = candidate_results[case]["round_ms"]["p50"]
+        lines.append(
+            f"{case[0]:>8} {case[1]:>8} {before:>10.2f}ms {after:>10.2f}ms "
+            f"{(after - before) / before:>+8.1%}"
+        )
+    return lines
+
+
+def main() -> None:
+    """Compare the runs given on the command line."""
+    if len(sys.argv) != 3:
+        sys.exit(f"usage: {sys.argv[0]} BASELINE CANDIDATE")
+    sys.stdout.write("\n".join(compare(sys.argv[1], sys.argv[2])) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Benchmark the refresh of SMA EV Charger coordinators and their entities.
+
+A round refreshes the coordinators of all chargers at once, i.e. requests the
+measurements from a stubbed device, decodes and indexes them, updates every
+entity and waits for the written states to be processed. All measurement values
+change in every round, so each round writes the states of all entities.
+
+Parameters are requested once during the warm up rounds and are not part of
+the results, just as they are only requested every parameter scan interval.
+
+The benchmarks only run if the SMAEV_BENCHMARK environment variable is set to
+the file the results are written to, e.g.
+
+    SMAEV_BENCHMARK=benchmarks/1.4.0.json pytest tests/benchmarks
+
+Use `python -m tests.benchmarks.compare` to compare the results of two runs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import platform
+from collections.abc import Callable, Iterator
+from copy import deepcopy
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pysmaev.core
+import pytest
+from homeassistant.const import CONF_SCAN_INTERVAL
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.core import HomeAssistant, callback
+from pysmaev.const import URL_MEASUREMENTS
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components import smaev
+from custom_components.smaev.const import (
+    CONF_PARAMETER_SCAN_INTERVAL,
+    SMAEV_COMPONENT_ID,
+    SMAEV_MEASUREMENT,
+    SMAEV_VALUE,
+)
+from custom_components.smaev.coordinator import SmaEvChargerCoordinator
+from custom_components.smaev.sensor import SENSOR_DESCRIPTIONS
+from custom_components.smaev.stats import percentiles
+
+from ..conftest import CONFIG_DATA, DEVICE_INFO, MockSmaEvCharger, mock_request_json
+
+RESULTS_FILE = os.environ.get("SMAEV_BENCHMARK")
+
+pytestmark = pytest.mark.skipif(
+    RESULTS_FILE is None, reason="SMAEV_BENCHMARK is not set"
+)
+
+MANIFEST = Path(__file__).parents[2] / "custom_components/smaev/manifest.json"
+
+WARMUP_ROUNDS = 3
+ROUNDS = 30
+
+# Synthetic measurement channels added to the catalogue of the fixtures.
+SYNTHETIC_CHANNEL = "Measurement.Benchmark.Chn{}"
+
+# Channels of enum sensors keep their value, other values would be unknown.
+CONSTANT_CHANNELS = {
+    description.channel
+    for description in SENSOR_DESCRIPTIONS
+    if description.value_mapping
+}
+
+RESULTS: list[dict[str, Any]] = []
+
+
+class StubDevice:
+    """Answer the queries of a charger with alternating measurement values.
+
+    The responses are encoded up front, decoding them is part of the benchmark
+    just as the device client decodes the responses of a real charger.
+    """
+
+    def __init__(self, synthetic_channels: int) -> None:
+        """Initialize the stub device."""
+        self.synthetic_channels = synthetic_channels
+        self.round = 0
+        self._responses: dict[tuple[str, str], tuple[bytes, bytes]] = {}
+
+    def _encode(self, url: str, data: str) -> tuple[bytes, bytes]:
+        """Return the two alternating responses to a query."""
+        result = mock_request_json("POST", url, data)
+        if url != URL_MEASUREMENTS:
+            body = json.dumps(result).encode()
+            return body, body
+        result.extend(
+            {
+                "channelId": SYNTHETIC_CHANNEL.format(index),
+                "componentId": SMAEV_COMPONENT_ID,
+                "values": [{"time": "2024-02-16T21:25:27.765Z", SMAEV_VALUE: 0}],
+            }
+            for index in range(self.synthetic_channels)
+        )
+        changed = deepcopy(result)
+        for channel in changed:
+            if channel["channelId"] not in CONSTANT_CHANNELS:
+                for value in channel["values"]:
+                    value[SMAEV_VALUE] += 1
+        return json.dumps(result).encode(), json.dumps(changed).encode()
+
+    async def request_json(
+        self, method: str, url: str, data: str, headers: Any = None
+    ) -> Any:
+        """Return the decoded response to a query."""
+        if (responses := self._responses.get((url, data))) is None:
+            responses = self._responses[url, data] = self._encode(url, data)
+        return json.loads(responses[self.round % 2])
+
+
+def add_synthetic_listeners(
+    coordinator: SmaEvChargerCoordinator, count: int
+) -> list[Callable[[], None]]:
+    """Register synthetic channels, each with a listener looking up its value."""
+    unsubscribers: list[Callable[[], None]] = []
+    for index in range(count):
+        channel_id = SYNTHETIC_CHANNEL.format(index)
+        unsubscribers.append(
+            coordinator.async_register_channel(SMAEV_MEASUREMENT, channel_id)
+        )
+
+        @callback
+        def _async_update(channel_id: str = channel_id) -> None:
+            coordinator.data.measurements[channel_id].value
+
+        unsubscribers.append(coordinator.async_add_listener(_async_update))
+    return unsubscribers
+
+
+@pytest.fixture(name="results", scope="module")
+def write_results() -> Iterator[list[dict[str, Any]]]:
+    """Write the results of all benchmarks once they finished."""
+    yield RESULTS
+    assert RESULTS_FILE is not None
+    path = Path(RESULTS_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {
+                "version": json.loads(MANIFEST.read_text())["version"],
+                "homeassistant": HA_VERSION,
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": RESULTS,
+            },
+            indent=2,
+        )
+        + "\n"
+    )
+
+
+@pytest.mark.parametrize("synthetic_channels", [0, 250])
+@pytest.mark.parametrize("chargers", [1, 10, 100])
+async def test_refresh(
+    hass: HomeAssistant,
+    results: list[dict[str, Any]],
+    chargers: int,
+    synthetic_channels: int,
+) -> None:
+    """Benchmark a refresh of all chargers."""
+    devices: list[StubDevice] = []
+
+    def evcharger_factory(*args: Any, **kwargs: Any) -> MockSmaEvCharger:
+        evcharger = MockSmaEvCharger(*args, **kwargs)
+        device = StubDevice(synthetic_channels)
+        devices.append(device)
+        evcharger.request_json = device.request_json  # type: ignore[method-assign]
+        evcharger.device_info = AsyncMock(  # type: ignore[method-assign]
+            return_value={**DEVICE_INFO, "serial": f"benchmark-{len(devices)}"}
+        )
+        return evcharger
+
+    entries = [
+        MockConfigEntry(
+            domain=smaev.DOMAIN,
+            title=f"charger {index}",
+            unique_id=f"benchmark-{index + 1}",
+            data={**CONFIG_DATA, "host": f"10.0.{index // 250}.{index % 250 + 1}"},
+            # Only the benchmark refreshes the coordinators.
+            options={CONF_SCAN_INTERVAL: 3600, CONF_PARAMETER_SCAN_INTERVAL: 3600},
+        )
+        for index in range(chargers)
+    ]
+    with patch.object(pysmaev.core, "SmaEvCharger", side_effect=evcharger_factory):
+        for entry in entries:
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    coordinators: list[SmaEvChargerCoordinator] = [
+        entry.runtime_data.coordinator for entry in entries
+    ]
+    for coordinator in coordinators:
+        add_synthetic_listeners(coordinator, synthetic_channels)
+
+    durations: list[float] = []
+    for round_ in range(WARMUP_ROUNDS + ROUNDS):
+        for device in devices:
+            device.round = round_
+        start = perf_counter()
+        await asyncio.gather(
+            *(coordinator.async_refresh() for coordinator in coordinators)
+        )
+        await hass.async_block_till_done()
+        if round_ >= WARMUP_ROUNDS:
+            durations.append(perf_counter() - start)
+
+    assert all(coordinator.last_update_success for coordinator in coordinators)
+    writes = sum(coordinator.stats.entity_writes for coordinator in coordinators)
+    round_ms = percentiles(duration * 1000 for duration in durations)
+    assert round_ms is not None
+    results.append(
+        {
+            "chargers": chargers,
+            "synthetic_channels": synthetic_channels,
+            "entities": len(hass.states.async_all()),
+            "rounds": ROUNDS,
+            "round_ms": {key: round(value, 3) for key, value in round_ms.items()},
+            "charger_ms": round(round_ms["p50"] / chargers, 4),
+            "state_writes_per_round": round(writes / (WARMUP_ROUNDS + ROUNDS), 1),
+        }
+    )
+
+    for entry in entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
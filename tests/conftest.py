@@ -3,12 +3,15 @@
 import json
 import os
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
 import pysmaev.core
 import pytest
 from homeassistant.const import CONF_HOST
+from homeassistant.util.dt import utcnow
+from pysmaev.const import URL_MEASUREMENTS, URL_PARAMETERS
 
 from custom_components import smaev
 
@@ -56,10 +59,79 @@ PARAMETERS = json.loads(
 )
 
 
+def mock_request_json(method, url, data, headers=None):
+    """Answer channel queries with the channels from the fixtures."""
+    query = json.loads(data)
+    if url == URL_MEASUREMENTS:
+        channel_ids = {item["channelId"] for item in query}
+        return [
+            channel for channel in MEASUREMENTS if channel["channelId"] in channel_ids
+        ]
+    if url == URL_PARAMETERS:
+        channel_ids = {item["channelId"] for item in query["queryItems"]}
+        return [
+            {
+                **component,
+                "values": [
+                    channel
+                    for channel in component["values"]
+                    if channel["channelId"] in channel_ids
+                ],
+            }
+            for component in PARAMETERS
+        ]
+    return {}
+
+
+def request_count(evcharger, url: str) -> int:
+    """Return the number of requests sent to the given url."""
+    return sum(
+        1 for call in evcharger.request_json.call_args_list if call.args[1] == url
+    )
+
+
+def next_refresh(hass, coordinator) -> datetime:
+    """Return a moment just after the next scheduled refresh of the coordinator."""
+    delay = coordinator.next_refresh() - hass.loop.time()
+    return utcnow() + timedelta(seconds=delay + 0.1)
+
+
+def stateful_request_json(values: dict[str, str]):
+    """Return a request_json side effect which keeps written parameter values."""
+
+    def request_json(method, url, data, headers=None):
+        if method == "PUT":
+            for channel in json.loads(data)["values"]:
+                values[channel["channelId"]] = channel["value"]
+            return {}
+        result = mock_request_json(method, url, data, headers)
+        if url == URL_PARAMETERS:
+            for component in result:
+                component["values"] = [
+                    {
+                        **channel,
+                        "value": values.get(channel["channelId"], channel["value"]),
+                    }
+                    for channel in component["values"]
+                ]
+        return result
+
+    return request_json
+
+
+TOKEN = {
+    "access_token": "access-token",
+    "refresh_token": "refresh-token",
+    "expires_in": 3600,
+}
+
+
 class MockSmaEvCharger(pysmaev.core.SmaEvCharger):
     """Mocked SmaEvCharger."""
 
     open = AsyncMock()
+    request_token = AsyncMock(return_value=TOKEN)
+    request_json = AsyncMock(side_effect=mock_request_json)
     request_measurements = AsyncMock(return_value=MEASUREMENTS)
     request_parameters = AsyncMock(return_value=PARAMETERS)
 
@@ -79,6 +151,21 @@ def create_entry():
     return entry
 
 
+@pytest.fixture(name="entries")
+def create_entries():
+    """Return mock entries of two chargers."""
+    return [
+        MockConfigEntry(
+            domain=smaev.DOMAIN,
+            title=host,
+            unique_id=f"123456789{idx}",
+            data={**CONFIG_DATA, CONF_HOST: host},
+            options={},
+        )
+        for idx, host in enumerate(("192.168.2.100", "192.168.2.101"))
+    ]
+
+
 @pytest.fixture(name="entry1_0")
 def entry1_0():
     """Return mock entry with version 1.0 (no unique_id, minor_version=0)."""
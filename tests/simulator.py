@@ -0,0 +1,412 @@
+"""Simulated SMA EV Charger web API for load and latency testing.
+
+Each simulated charger serves the token, measurement and parameter endpoints of
+the charger from the fixtures. Its values evolve over time: vehicles connect,
+charge and disconnect in a repeating cycle and the session and total energy
+increase while charging. Latency, jitter, errors and dropped connections can be
+added to every request.
+
+Run any number of chargers on consecutive ports, e.g.
+
+    python -m tests.simulator --chargers 100 --port 8000 --latency 0.05
+
+and add them with the host `127.0.0.1:<port>` and SSL disabled. The credentials
+are the username and password given on the command line.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import secrets
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+from pysmaev.const import (
+    URL_MEASUREMENTS,
+    URL_PARAMETERS,
+    URL_SET_PARAMETERS,
+    URL_TOKEN,
+    SmaEvChargerMeasurements,
+    SmaEvChargerParameters,
+)
+from pysmaev.helpers import evchargerformat
+
+_LOGGER = logging.getLogger(__name__)
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+COMPONENT_ID = "IGULD:SELF"
+
+USERNAME = "Test"
+PASSWORD = "Tester1234&"
+
+SESSION_ENERGY_CHANNEL = "Measurement.ChaSess.WhIn"
+ENERGY_CHANNELS = (
+    SESSION_ENERGY_CHANNEL,
+    "Measurement.Metering.GridMs.TotWhIn",
+    "Measurement.Metering.GridMs.TotWhIn.ChaSta",
+)
+
+GRID_VOLTAGE = 230.0
+PHASES = 3
+
+# Duration of the phases of the charging cycle in seconds. Vehicles connect,
+# start charging after a while and stay connected for some time once charged.
+CHARGING_CYCLE: tuple[tuple[SmaEvChargerMeasurements, float], ...] = (
+    (SmaEvChargerMeasurements.NOT_CONNECTED, 300),
+    (SmaEvChargerMeasurements.SLEEP_MODE, 60),
+    (SmaEvChargerMeasurements.ACTIVE_MODE, 1800),
+    (SmaEvChargerMeasurements.SLEEP_MODE, 120),
+)
+
+
+@dataclass
+class SimulatorConfig:
+    """Behavior of the simulated chargers."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    drop_rate: float = 0.0
+    # Factor the charging cycle is sped up by.
+    speed: float = 1.0
+    token_lifetime: int = 3600
+    username: str = USERNAME
+    password: str = PASSWORD
+
+
+class SimulatedCharger:
+    """State of a simulated charger.
+
+    The measurements are computed from the position in the charging cycle and
+    the charging parameters whenever they are requested.
+    """
+
+    def __init__(
+        self,
+        serial: str,
+        config: SimulatorConfig,
+        rng: random.Random,
+        time_func: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the simulated charger."""
+        self.serial = serial
+        self.config = config
+        self.rng = rng
+        self._time = time_func
+        self.measurements: dict[str, dict[str, Any]] = {
+            channel["channelId"]: channel
+            for channel in json.loads((FIXTURES / "measurements.json").read_text())
+        }
+        self.parameters: dict[str, dict[str, Any]] = {
+            channel["channelId"]: channel
+            for component in json.loads((FIXTURES / "parameters.json").read_text())
+            for channel in component["values"]
+        }
+        self.parameters["Parameter.Nameplate.SerNum"]["value"] = serial
+        self.parameters["Parameter.Nameplate.Location"]["value"] = f"Simulated {serial}"
+        # Charge right away instead of the charge stop in the fixtures.
+        self.parameters["Parameter.Chrg.ActChaMod"]["value"] = (
+            SmaEvChargerParameters.BOOST_CHARGING
+        )
+        self.access_tokens: dict[str, float] = {}
+        self.refresh_tokens: set[str] = set()
+        self._start = self._time()
+        # Chargers start at different positions of the cycle.
+        self._cycle_offset = rng.uniform(0, sum(phase for _, phase in CHARGING_CYCLE))
+        self._updated = self._start
+        self.charging_state = self._cycle_state(self._start)
+        # Energy counters in Wh, kept unrounded between requests.
+        self.energy: dict[str, float] = {
+            channel_id: float(self._value(channel_id)) for channel_id in ENERGY_CHANNELS
+        }
+
+    def _cycle_state(self, now: float) -> SmaEvChargerMeasurements:
+        """Return the charging state at the given time."""
+        position = ((now - self._start) * self.config.speed + self._cycle_offset) % sum(
+            phase for _, phase in CHARGING_CYCLE
+        )
+        for state, duration in CHARGING_CYCLE:
+            if position < duration:
+                return state
+            position -= duration
+        return CHARGING_CYCLE[-1][0]
+
+    def _value(self, channel_id: str) -> Any:
+        """Return the current value of a measurement channel."""
+        return self.measurements[channel_id]["values"][0].get("value")
+
+    def _set(self, channel_id: str, value: Any) -> None:
+        """Set the value of a measurement channel."""
+        self.measurements[channel_id]["values"] = [
+            {"time": evchargerformat(datetime.now(tz=UTC)), "value": value}
+        ]
+
+    @property
+    def charge_current(self) -> float:
+        """Return the current per phase while charging."""
+        if (
+            self.parameters["Parameter.Chrg.ActChaMod"]["value"]
+            == SmaEvChargerParameters.CHARGE_STOP
+        ):
+            return 0.0
+        current = float(self.parameters["Parameter.Inverter.AcALim"]["value"])
+        max_power = float(self.parameters["Parameter.Inverter.WMaxIn"]["value"])
+        return min(current, max_power / (PHASES * GRID_VOLTAGE))
+
+    def update(self) -> None:
+        """Advance the measurements to the current time."""
+        now = self._time()
+        elapsed = (now - self._updated) * self.config.speed
+        self._updated = now
+
+        state = self._cycle_state(now)
+        if (
+            state == SmaEvChargerMeasurements.SLEEP_MODE
+            and self.charging_state == SmaEvChargerMeasurements.NOT_CONNECTED
+        ):
+            # A new session starts once a vehicle is connected.
+            self.energy[SESSION_ENERGY_CHANNEL] = 0.0
+        self.charging_state = state
+
+        current = (
+            self.charge_current if state == SmaEvChargerMeasurements.ACTIVE_MODE else 0
+        )
+        voltages = [GRID_VOLTAGE + self.rng.uniform(-3, 3) for _ in range(PHASES)]
+        power = round(sum(voltage * current for voltage in voltages))
+        energy = power * elapsed / 3600
+
+        self._set("Measurement.Operation.EVeh.ChaStt", int(state))
+        for phase, voltage in zip("ABC", voltages, strict=True):
+            self._set(f"Measurement.GridMs.PhV.phs{phase}", round(voltage, 1))
+            self._set(f"Measurement.GridMs.A.phs{phase}", round(current, 2))
+        self._set("Measurement.GridMs.Hz", round(50 + self.rng.uniform(-0.05, 0.05), 2))
+        for channel_id in (
+            "Measurement.GridMs.TotVA",
+            "Measurement.Metering.GridMs.TotWIn",
+            "Measurement.Metering.GridMs.TotWIn.ChaSta",
+        ):
+            self._set(channel_id, power)
+        for channel_id in ENERGY_CHANNELS:
+            self.energy[channel_id] += energy
+            self._set(channel_id, round(self.energy[channel_id]))
+
+    def issue_token(self) -> dict[str, Any]:
+        """Issue a new access and refresh token."""
+        now = self._time()
+        access_token = secrets.token_hex(16)
+        refresh_token = secrets.token_hex(16)
+        self.access_tokens = {
+            token: expiry
+            for token, expiry in self.access_tokens.items()
+            if expiry > now
+        }
+        self.access_tokens[access_token] = now + self.config.token_lifetime
+        self.refresh_tokens.add(refresh_token)
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "expires_in": self.config.token_lifetime,
+            "token_type": "Bearer",
+        }
+
+    def authorized(self, request: web.Request) -> bool:
+        """Return True if the request carries a valid access token."""
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        return scheme == "Bearer" and self.access_tokens.get(token, 0) > self._time()
+
+
+def _channel_ids(items: list[dict[str, Any]]) -> set[str] | None:
+    """Return the queried channel ids, or None if all channels were queried."""
+    if any("channelId" not in item for item in items):
+        return None
+    return {item["channelId"] for item in items}
+
+
+class SimulatedChargerApi:
+    """Request handlers of the web API of a simulated charger."""
+
+    def __init__(self, charger: SimulatedCharger) -> None:
+        """Initialize the request handlers."""
+        self.charger = charger
+        self.config = charger.config
+
+    @web.middleware
+    async def faults(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        """Delay requests, fail them or drop the connection."""
+        rng = self.charger.rng
+        if delay := max(0.0, rng.gauss(self.config.latency, self.config.jitter)):
+            await asyncio.sleep(delay)
+        if rng.random() < self.config.drop_rate:
+            if request.transport is not None:
+                request.transport.close()
+            return web.Response()
+        if rng.random() < self.config.error_rate:
+            raise web.HTTPServiceUnavailable
+        if request.path != URL_TOKEN and not self.charger.authorized(request):
+            raise web.HTTPUnauthorized
+        return await handler(request)
+
+    async def token(self, request: web.Request) -> web.Response:
+        """Issue a token for the credentials or a refresh token."""
+        data = await request.post()
+        if data.get("grant_type") == "refresh_token":
+            refresh_token = str(data.get("refresh_token"))
+            if refresh_token not in self.charger.refresh_tokens:
+                raise web.HTTPUnauthorized
+            self.charger.refresh_tokens.discard(refresh_token)
+        elif (data.get("username"), data.get("password")) != (
+            self.config.username,
+            self.config.password,
+        ):
+            raise web.HTTPUnauthorized
+        return web.json_response(self.charger.issue_token())
+
+    async def measurements(self, request: web.Request) -> web.Response:
+        """Return the queried measurement channels."""
+        channel_ids = _channel_ids(await request.json())
+        self.charger.update()
+        return web.json_response(
+            [
+                channel
+                for channel_id, channel in self.charger.measurements.items()
+                if channel_ids is None or channel_id in channel_ids
+            ]
+        )
+
+    async def parameters(self, request: web.Request) -> web.Response:
+        """Return the queried parameter channels."""
+        channel_ids = _channel_ids((await request.json())["queryItems"])
+        return web.json_response(
+            [
+                {
+                    "componentId": COMPONENT_ID,
+                    "values": [
+                        channel
+                        for channel_id, channel in self.charger.parameters.items()
+                        if channel_ids is None or channel_id in channel_ids
+                    ],
+                }
+            ]
+        )
+
+    async def set_parameters(self, request: web.Request) -> web.Response:
+        """Write editable parameter channels."""
+        if request.match_info["component_id"] != COMPONENT_ID:
+            raise web.HTTPNotFound
+        values = (await request.json())["values"]
+        if not all(
+            self.charger.parameters.get(value["channelId"], {}).get("editable")
+            for value in values
+        ):
+            raise web.HTTPBadRequest
+        for value in values:
+            self.charger.parameters[value["channelId"]].update(
+                value=value["value"], timestamp=value["timestamp"]
+            )
+        self.charger.update()
+        return web.json_response({})
+
+
+def create_app(charger: SimulatedCharger) -> web.Application:
+    """Return the web application serving a simulated charger."""
+    api = SimulatedChargerApi(charger)
+    app = web.Application(middlewares=[api.faults])
+    app.router.add_post(URL_TOKEN, api.token)
+    app.router.add_post(URL_MEASUREMENTS, api.measurements)
+    app.router.add_post(URL_PARAMETERS, api.parameters)
+    app.router.add_put(f"{URL_SET_PARAMETERS}/{{component_id}}", api.set_parameters)
+    return app
+
+
+async def async_run(
+    chargers: int, host: str, port: int, config: SimulatorConfig, seed: int | None
+) -> None:
+    """Serve the simulated chargers on consecutive ports until cancelled."""
+    rng = random.Random(seed)
+    runners: list[web.AppRunner] = []
+    try:
+        for index in range(chargers):
+            charger = SimulatedCharger(
+                f"{9000000000 + index}", config, random.Random(rng.random())
+            )
+            runner = web.AppRunner(create_app(charger), access_log=None)
+            await runner.setup()
+            await web.TCPSite(runner, host, port + index).start()
+            runners.append(runner)
+        _LOGGER.info(
+            "Simulating %s chargers at %s:%s-%s",
+            chargers,
+            host,
+            port,
+            port + chargers - 1,
+        )
+        await asyncio.Event().wait()
+    finally:
+        for runner in runners:
+            await runner.cleanup()
+
+
+def main() -> None:
+    """Run the simulator with the options of the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chargers", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument(
+        "--port", type=int, default=8000, help="port of the first charger"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="mean delay in seconds"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="standard deviation of the delay"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="share of requests answered with 503",
+    )
+    parser.add_argument(
+        "--drop-rate", type=float, default=0.0, help="share of connections dropped"
+    )
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="speed up of the charging cycle"
+    )
+    parser.add_argument("--token-lifetime", type=int, default=3600)
+    parser.add_argument("--username", default=USERNAME)
+    parser.add_argument("--password", default=PASSWORD)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config = SimulatorConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        speed=args.speed,
+        token_lifetime=args.token_lifetime,
+        username=args.username,
+        password=args.password,
+    )
+    with suppress(KeyboardInterrupt):
+        asyncio.run(async_run(args.chargers, args.host, args.port, config, args.seed))
+
+
+if __name__ == "__main__":
+    main()
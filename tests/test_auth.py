@@ -0,0 +1,96 @@
+"""Test the token handling of the SMA EV Charger integration."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pysmaev.core
+from aiohttp import ClientResponseError
+from homeassistant.config_entries import SOURCE_REAUTH, ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from .conftest import TOKEN, MockSmaEvCharger
+
+
+def token_key(entry) -> str:
+    """Return the storage key of the token of a config entry."""
+    return f"smaev.{entry.entry_id}.token"
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_token_persisted(hass: HomeAssistant, hass_storage, entry) -> None:
+    """Test the refresh token is persisted and removed with the entry."""
+    entry.add_to_hass(hass)
+    with patch.object(
+        MockSmaEvCharger, "request_token", AsyncMock(return_value=TOKEN)
+    ) as mock_request_token:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    # Without a stored token the credentials are used.
+    mock_request_token.assert_called_once_with(
+        auto_refresh=False, force_credentials=True
+    )
+    assert hass_storage[token_key(entry)]["data"] == {
+        "refresh_token": TOKEN["refresh_token"]
+    }
+
+    assert await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert token_key(entry) not in hass_storage
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_stored_token_reused(hass: HomeAssistant, hass_storage, entry) -> None:
+    """Test a stored refresh token is used instead of the credentials."""
+    hass_storage[token_key(entry)] = {
+        "version": 1,
+        "key": token_key(entry),
+        "data": {"refresh_token": "stored-token"},
+    }
+    entry.add_to_hass(hass)
+    with patch.object(
+        MockSmaEvCharger, "request_token", AsyncMock(return_value=TOKEN)
+    ) as mock_request_token:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    mock_request_token.assert_called_once_with(
+        auto_refresh=False, force_credentials=False
+    )
+    assert entry.runtime_data.evcharger.refresh_token == "stored-token"
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_rejected_token_falls_back_to_credentials(
+    hass: HomeAssistant, hass_storage, entry
+) -> None:
+    """Test the credentials are used if the stored token is rejected."""
+    hass_storage[token_key(entry)] = {
+        "version": 1,
+        "key": token_key(entry),
+        "data": {"refresh_token": "expired-token"},
+    }
+    entry.add_to_hass(hass)
+    rejected = ClientResponseError(Mock(), (), status=401)
+    with patch.object(
+        MockSmaEvCharger, "request_token", AsyncMock(side_effect=[rejected, TOKEN])
+    ) as mock_request_token:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert [call.kwargs for call in mock_request_token.call_args_list] == [
+        {"auto_refresh": False, "force_credentials": False},
+        {"auto_refresh": False, "force_credentials": True},
+    ]
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_empty_token_retried(hass: HomeAssistant, entry) -> None:
+    """Test an empty token response is retried instead of reauthenticated."""
+    entry.add_to_hass(hass)
+    with patch.object(MockSmaEvCharger, "request_token", AsyncMock(return_value={})):
+        assert not await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.SETUP_RETRY
+    assert not entry.async_get_active_flows(hass, {SOURCE_REAUTH})
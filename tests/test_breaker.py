@@ -0,0 +1,41 @@
+"""Test the circuit breaker of the SMA EV Charger integration."""
+
+from custom_components.smaev.breaker import CircuitBreaker, CircuitState
+
+
+def test_circuit_breaker() -> None:
+    """Test the breaker opens, backs off exponentially and closes on success."""
+    now = 0.0
+    breaker = CircuitBreaker(lambda: now, 2, 10, 25)
+
+    assert breaker.retry_after() is None
+    assert breaker.record_failure() is None
+    assert breaker.state is CircuitState.CLOSED
+
+    # The circuit opens after the failure threshold was reached.
+    assert breaker.record_failure() == 10
+    assert breaker.state is CircuitState.OPEN
+    now = 4.0
+    assert breaker.retry_after() == 10
+    now = 8.0
+    assert breaker.retry_after() == 10
+    now = 10.0
+
+    # A single probe is let through once the backoff passed.
+    assert breaker.retry_after() is None
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.retry_after() == 10
+
+    # A failed probe doubles the backoff, up to the maximum.
+    assert breaker.record_failure() == 20
+    assert breaker.state is CircuitState.OPEN
+    now = 30.0
+    assert breaker.retry_after() is None
+    assert breaker.record_failure() == 25
+
+    now = 55.0
+    assert breaker.retry_after() is None
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.failures == 0
+    assert breaker.retry_after() is None
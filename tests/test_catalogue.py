@@ -0,0 +1,188 @@
+"""Test the cached catalogue of the SMA EV Charger integration."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pysmaev.core
+from aiohttp import ClientResponseError
+from homeassistant.config_entries import SOURCE_REAUTH, ConfigEntryState
+from homeassistant.core import HomeAssistant
+from pysmaev.exceptions import (
+    SmaEvChargerAuthenticationError,
+    SmaEvChargerConnectionError,
+)
+
+from custom_components.smaev.catalogue import REVALIDATE_RETRY_DELAY
+from custom_components.smaev.const import SMAEV_MEASUREMENT, SMAEV_PARAMETER
+
+from .conftest import DEVICE_INFO, MEASUREMENTS, PARAMETERS, MockSmaEvCharger
+
+CATALOGUE_KEY = f"smaev.{DEVICE_INFO['serial']}.catalogue"
+
+CATALOGUE = {
+    "device_info": DEVICE_INFO,
+    "channels": {
+        SMAEV_MEASUREMENT: [channel["channelId"] for channel in MEASUREMENTS],
+        SMAEV_PARAMETER: [channel["channelId"] for channel in PARAMETERS[0]["values"]],
+    },
+    "writable_channels": [
+        channel["channelId"]
+        for channel in PARAMETERS[0]["values"]
+        if channel["editable"]
+    ],
+}
+
+
+def store_catalogue(hass_storage, catalogue) -> None:
+    """Store a cached catalogue."""
+    hass_storage[CATALOGUE_KEY] = {
+        "version": 1,
+        "key": CATALOGUE_KEY,
+        "data": catalogue,
+    }
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_catalogue_cached(hass: HomeAssistant, hass_storage, entry) -> None:
+    """Test the catalogue is fetched and cached on the first setup."""
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass_storage[CATALOGUE_KEY]["data"] == CATALOGUE
+
+    assert await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert CATALOGUE_KEY not in hass_storage
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_setup_from_cache_while_unreachable(
+    hass: HomeAssistant, hass_storage, entry
+) -> None:
+    """Test setup succeeds from the cache while the charger is unreachable."""
+    store_catalogue(hass_storage, CATALOGUE)
+    entry.add_to_hass(hass)
+    with patch.object(
+        MockSmaEvCharger,
+        "request_token",
+        AsyncMock(side_effect=SmaEvChargerConnectionError),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert hass.states.get("sensor.smaev_1234567890_charging_session_energy")
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_setup_retried_on_http_error(hass: HomeAssistant, entry) -> None:
+    """Test setup is retried if fetching the catalogue fails with an HTTP error."""
+    entry.add_to_hass(hass)
+    with patch.object(
+        MockSmaEvCharger,
+        "get_measurement_channels",
+        AsyncMock(side_effect=ClientResponseError(Mock(), (), status=503)),
+    ):
+        assert not await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.SETUP_RETRY
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_revalidation_retried_on_http_error(
+    hass: HomeAssistant, hass_storage, entry
+) -> None:
+    """Test revalidation is retried if the charger responds with an HTTP error."""
+    store_catalogue(hass_storage, CATALOGUE)
+    entry.add_to_hass(hass)
+    with (
+        patch.object(
+            MockSmaEvCharger,
+            "get_measurement_channels",
+            AsyncMock(side_effect=ClientResponseError(Mock(), (), status=503)),
+        ),
+        patch("custom_components.smaev.catalogue.async_call_later") as mock_call_later,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert mock_call_later.call_args.args[1] == REVALIDATE_RETRY_DELAY
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_reauth_on_revalidation(hass: HomeAssistant, hass_storage, entry) -> None:
+    """Test revalidation starts a reauthentication if the credentials fail."""
+    store_catalogue(hass_storage, CATALOGUE)
+    entry.add_to_hass(hass)
+    with patch.object(
+        MockSmaEvCharger,
+        "request_token",
+        AsyncMock(side_effect=SmaEvChargerAuthenticationError),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert len(entry.async_get_active_flows(hass, {SOURCE_REAUTH})) == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_reload_on_firmware_change(
+    hass: HomeAssistant, hass_storage, entry
+) -> None:
+    """Test the entry is reloaded if the firmware changed since it was cached."""
+    store_catalogue(
+        hass_storage,
+        {**CATALOGUE, "device_info": {**DEVICE_INFO, "sw_version": "1.2.22.R"}},
+    )
+    entry.add_to_hass(hass)
+    with patch.object(hass.config_entries, "async_schedule_reload") as mock_reload:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    mock_reload.assert_called_once_with(entry.entry_id)
+    assert hass_storage[CATALOGUE_KEY]["data"] == CATALOGUE
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_reload_on_permission_change(
+    hass: HomeAssistant, hass_storage, entry
+) -> None:
+    """Test the entry is reloaded if the account may write other parameters."""
+    store_catalogue(hass_storage, {**CATALOGUE, "writable_channels": []})
+    entry.add_to_hass(hass)
+    with patch.object(hass.config_entries, "async_schedule_reload") as mock_reload:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    mock_reload.assert_called_once_with(entry.entry_id)
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_no_reload_if_unchanged(hass: HomeAssistant, hass_storage, entry) -> None:
+    """Test the entry is not reloaded if the catalogue is still valid."""
+    store_catalogue(hass_storage, CATALOGUE)
+    entry.add_to_hass(hass)
+    with patch.object(hass.config_entries, "async_schedule_reload") as mock_reload:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    mock_reload.assert_not_called()
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
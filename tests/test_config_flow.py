@@ -1,16 +1,32 @@
 """Tests for the SMA EV Charger config flow."""
 
+from datetime import timedelta
 from unittest.mock import patch
 
 import pysmaev.core
 import pysmaev.exceptions
 import pytest
 from homeassistant import config_entries, data_entry_flow
-from homeassistant.const import CONF_BASE, CONF_HOST
+from homeassistant.const import (
+    CONF_BASE,
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+)
 from homeassistant.core import HomeAssistant
 
 from custom_components import smaev
 from custom_components.smaev.config_flow import SmaEvChargerConfigFlow, validate_input
+from custom_components.smaev.const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_IDLE_SCAN_INTERVAL,
+    CONF_METRICS,
+    CONF_PARAMETER_SCAN_INTERVAL,
+    CONF_POLL_JITTER,
+    CONF_SESSION_STATISTICS,
+    CONF_WRITE_DEBOUNCE,
+)
 
 from .conftest import CONFIG_DATA, DEVICE_INFO, MockConfigEntry, MockSmaEvCharger
 
@@ -97,6 +113,33 @@ async def test_step_reconfigure(hass: HomeAssistant, entry: MockSmaEvCharger):
     assert entry.data == {**old_entry_data, **CONFIG_DATA}
 
 
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_step_reauth(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Test for reauth step."""
+    entry.add_to_hass(hass)
+
+    result = await entry.start_reauth_flow(hass)
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["step_id"] == "reauth_confirm"
+
+    with patch(
+        "pysmaev.core.SmaEvCharger.open",
+        side_effect=pysmaev.exceptions.SmaEvChargerAuthenticationError,
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_USERNAME: "Test", CONF_PASSWORD: "wrong"}
+        )
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["errors"] == {CONF_BASE: "invalid_auth"}
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_USERNAME: "Test", CONF_PASSWORD: "Tester5678&"}
+    )
+    assert result["type"] == data_entry_flow.FlowResultType.ABORT
+    assert result["reason"] == "reauth_successful"
+    assert entry.data == {**CONFIG_DATA, CONF_PASSWORD: "Tester5678&"}
+
+
 @pytest.mark.parametrize(
     ("error", "errors"),
     [
@@ -164,3 +207,46 @@ async def test_validate_connection_raises_error(hass: HomeAssistant, error, erro
 
     assert result_errors == errors
     assert serial is None
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_options_flow(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Test the options flow applies the options without reloading the entry."""
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = entry.runtime_data.coordinator
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    options = {
+        CONF_SCAN_INTERVAL: 10,
+        CONF_PARAMETER_SCAN_INTERVAL: 300,
+        CONF_ADAPTIVE_POLLING: True,
+        CONF_IDLE_SCAN_INTERVAL: 600,
+        CONF_WRITE_DEBOUNCE: 1.5,
+        CONF_POLL_JITTER: 2.0,
+        CONF_METRICS: True,
+        CONF_SESSION_STATISTICS: True,
+    }
+    with patch.object(MockSmaEvCharger, "request_token") as mock_request_token:
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], user_input=options
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert entry.options == options
+    # Options are applied to the running coordinator, no reload took place.
+    assert entry.runtime_data.coordinator is coordinator
+    mock_request_token.assert_not_called()
+    assert coordinator.scan_interval == timedelta(seconds=10)
+    assert coordinator.parameter_update_interval == timedelta(seconds=300)
+    assert coordinator.adaptive_polling
+    assert coordinator.session_statistics
+    assert coordinator.idle_update_interval == timedelta(seconds=600)
+    assert coordinator.write_debounce == 1.5
+    assert coordinator.poll_jitter == 2.0
+    assert coordinator.stats.metrics is not None
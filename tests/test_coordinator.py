@@ -0,0 +1,456 @@
+"""Test the SMA EV Charger coordinator."""
+
+import asyncio
+import json
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+import pysmaev.core
+import pytest
+from aiohttp import ClientResponseError
+from homeassistant.config_entries import SOURCE_REAUTH, ConfigEntryState
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util.dt import utcnow
+from pysmaev.const import URL_MEASUREMENTS, URL_PARAMETERS, SmaEvChargerMeasurements
+from pysmaev.exceptions import (
+    SmaEvChargerAuthenticationError,
+    SmaEvChargerConnectionError,
+)
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components import smaev
+from custom_components.smaev.breaker import CircuitState
+from custom_components.smaev.const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MIN_BACKOFF,
+    CONF_ADAPTIVE_POLLING,
+    CONF_IDLE_SCAN_INTERVAL,
+    DEFAULT_PARAMETER_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    SMAEV_CHARGING_STATE_CHANNEL,
+    SMAEV_PARAMETER,
+)
+from custom_components.smaev.coordinator import index_measurements, index_parameters
+
+from .conftest import (
+    CONFIG_DATA,
+    MEASUREMENTS,
+    PARAMETERS,
+    MockSmaEvCharger,
+    mock_request_json,
+    next_refresh,
+    request_count,
+    stateful_request_json,
+)
+
+
+def requested_channels(evcharger, url: str) -> set[str]:
+    """Return the channel ids of the last request sent to the given url."""
+    for call in reversed(evcharger.request_json.call_args_list):
+        if call.args[1] == url:
+            query = json.loads(call.args[2])
+            items = query["queryItems"] if url == URL_PARAMETERS else query
+            return {item["channelId"] for item in items}
+    return set()
+
+
+async def test_parameters_polled_slowly(hass: HomeAssistant, entry, evcharger) -> None:
+    """Test parameters are only fetched once the parameter interval elapsed."""
+    coordinator = entry.runtime_data.coordinator
+    measurement_calls = request_count(evcharger, URL_MEASUREMENTS)
+    parameter_calls = request_count(evcharger, URL_PARAMETERS)
+
+    # First update fetches both measurements and parameters.
+    async_fire_time_changed(hass, next_refresh(hass, coordinator))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert request_count(evcharger, URL_MEASUREMENTS) == measurement_calls + 1
+    assert request_count(evcharger, URL_PARAMETERS) == parameter_calls + 1
+
+    # Following updates only fetch measurements.
+    async_fire_time_changed(hass, next_refresh(hass, coordinator))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert request_count(evcharger, URL_MEASUREMENTS) == measurement_calls + 2
+    assert request_count(evcharger, URL_PARAMETERS) == parameter_calls + 1
+
+    # Parameters are fetched again once the parameter interval elapsed.
+    coordinator._parameters_updated -= DEFAULT_PARAMETER_SCAN_INTERVAL
+    async_fire_time_changed(hass, next_refresh(hass, coordinator))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert request_count(evcharger, URL_PARAMETERS) == parameter_calls + 2
+
+
+async def test_scheduled_refresh_in_background(
+    hass: HomeAssistant, entry, evcharger
+) -> None:
+    """Test scheduled refreshes run as background tasks of the config entry."""
+    coordinator = entry.runtime_data.coordinator
+    measurement_calls = request_count(evcharger, URL_MEASUREMENTS)
+
+    with patch.object(
+        entry,
+        "async_create_background_task",
+        wraps=entry.async_create_background_task,
+    ) as create_background_task:
+        async_fire_time_changed(hass, next_refresh(hass, coordinator))
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    create_background_task.assert_called_once()
+    assert request_count(evcharger, URL_MEASUREMENTS) == measurement_calls + 1
+
+
+async def test_set_parameter(hass: HomeAssistant, entry, evcharger) -> None:
+    """Test a written parameter is applied and confirmed by a targeted read."""
+    coordinator = entry.runtime_data.coordinator
+    await coordinator.async_refresh()
+    channel_id = "Parameter.Chrg.ActChaMod"
+    with patch.object(
+        evcharger, "request_json", side_effect=stateful_request_json({})
+    ) as mock:
+        await coordinator.async_set_parameter(channel_id, "4718")
+
+    assert coordinator.data.parameters[channel_id].value == "4718"
+    # Only the written channel was read back, no full refresh took place.
+    confirm_calls = [
+        call for call in mock.call_args_list if call.args[1] == URL_PARAMETERS
+    ]
+    assert len(confirm_calls) == 1
+    assert json.loads(confirm_calls[0].args[2])["queryItems"] == [
+        {"componentId": "IGULD:SELF", "channelId": channel_id}
+    ]
+    assert not any(call.args[1] == URL_MEASUREMENTS for call in mock.call_args_list)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [ClientResponseError(Mock(), (), status=503), TimeoutError()],
+)
+async def test_set_parameters_unconfirmed(
+    hass: HomeAssistant, entry, evcharger, error: Exception
+) -> None:
+    """Test a write is kept if reading it back fails."""
+    coordinator = entry.runtime_data.coordinator
+    await coordinator.async_refresh()
+    channel_id = "Parameter.Chrg.ActChaMod"
+    write = stateful_request_json({})
+
+    def request_json(method, url, data, headers=None):
+        if url == URL_PARAMETERS:
+            raise error
+        return write(method, url, data, headers)
+
+    with patch.object(evcharger, "request_json", side_effect=request_json):
+        results = await coordinator.async_set_parameters({channel_id: "4718"})
+
+    assert results == {channel_id: None}
+    assert coordinator.data.parameters[channel_id].value == "4718"
+    # The value is confirmed with the next update.
+    assert coordinator.parameters_due
+
+
+async def test_debounced_writes_coalesced(
+    hass: HomeAssistant, entry, evcharger
+) -> None:
+    """Test writes within the debounce window are coalesced to the last value."""
+    coordinator = entry.runtime_data.coordinator
+    channel_id = "Parameter.Inverter.AcALim"
+    # The current limit entity is disabled by default.
+    coordinator.async_register_channel(SMAEV_PARAMETER, channel_id)
+    await coordinator.async_refresh()
+    coordinator.write_debounce = 0.01
+    with patch.object(
+        evcharger, "request_json", side_effect=stateful_request_json({})
+    ) as mock:
+        await asyncio.gather(
+            *(
+                coordinator.async_set_parameter_debounced(channel_id, value)
+                for value in ("6", "8", "10")
+            )
+        )
+
+    writes = [call for call in mock.call_args_list if call.args[0] == "PUT"]
+    assert len(writes) == 1
+    assert json.loads(writes[0].args[2])["values"][0]["value"] == "10"
+    assert coordinator.data.parameters[channel_id].value == "10"
+
+
+async def test_debounced_write_failed_on_unload(
+    hass: HomeAssistant, entry, evcharger
+) -> None:
+    """Test a pending debounced write fails once the entry is unloaded."""
+    coordinator = entry.runtime_data.coordinator
+    coordinator.write_debounce = 60
+    write = hass.async_create_task(
+        coordinator.async_set_parameter_debounced("Parameter.Inverter.AcALim", "10")
+    )
+    await asyncio.sleep(0)
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    with pytest.raises(HomeAssistantError, match="Integration is shutting down"):
+        await write
+    assert not any(
+        call.args[0] == "PUT" for call in evcharger.request_json.call_args_list
+    )
+
+
+async def test_channels_decoded_once_per_change(
+    hass: HomeAssistant, entry, evcharger
+) -> None:
+    """Test a decoder only runs again once the value of its channel changed."""
+    coordinator = entry.runtime_data.coordinator
+    channel_id = "Parameter.Inverter.AcALim"
+    decoder = Mock(side_effect=lambda channel: float(channel.value))
+    unregister = coordinator.async_register_channel(
+        SMAEV_PARAMETER, channel_id, decoder
+    )
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+
+    assert decoder.call_count == 1
+    assert coordinator.data.decoded[decoder] == 16.0
+
+    with patch.object(evcharger, "request_json", side_effect=stateful_request_json({})):
+        await coordinator.async_set_parameter(channel_id, "10")
+
+    assert decoder.call_count == 2
+    assert coordinator.data.decoded[decoder] == 10.0
+
+    unregister()
+    await coordinator.async_refresh()
+    assert decoder not in coordinator.data.decoded
+
+
+def test_index_channels(channel_values) -> None:
+    """Test the measurement and parameter channels are indexed by channel id."""
+    measurements = index_measurements(MEASUREMENTS)
+    parameters = index_parameters(PARAMETERS)
+
+    assert len(measurements) == len(MEASUREMENTS)
+    assert len(parameters) == len(PARAMETERS[0]["values"])
+    for channel_id, channel in measurements.items():
+        assert channel.value == channel_values[channel_id]
+    for channel_id, channel in parameters.items():
+        assert channel.value == (channel_values[channel_id] or "")
+    assert parameters["Parameter.Inverter.AcALim"].min == 6.0
+    assert parameters["Parameter.Inverter.AcALim"].max == 32.0
+    assert parameters["Parameter.Chrg.ActChaMod"].possible_values == ("4718", "4721")
+
+
+async def test_coordinator_data_indexed(hass: HomeAssistant, entry, evcharger) -> None:
+    """Test the coordinator data holds the indexed channels."""
+    coordinator = entry.runtime_data.coordinator
+    await coordinator.async_refresh()
+
+    measurements = index_measurements(MEASUREMENTS)
+    parameters = index_parameters(PARAMETERS)
+    for channel_id, channel in coordinator.data.measurements.items():
+        assert channel == measurements[channel_id]
+    for channel_id, channel in coordinator.data.parameters.items():
+        assert channel == parameters[channel_id]
+
+
+async def test_only_enabled_channels_requested(
+    hass: HomeAssistant, entity_registry: er.EntityRegistry, entry, evcharger
+) -> None:
+    """Test only the channels of enabled entities are requested."""
+    coordinator = entry.runtime_data.coordinator
+    await coordinator.async_refresh()
+
+    channels = requested_channels(evcharger, URL_MEASUREMENTS)
+    assert "Measurement.ChaSess.WhIn" in channels
+    # Disabled by default
+    assert "Measurement.GridMs.Hz" not in channels
+    assert set(coordinator.data.measurements) == channels
+
+    entity_id = entity_registry.async_get_entity_id(
+        "sensor", "smaev", f"{entry.unique_id}-charging_session_energy"
+    )
+    entity_registry.async_update_entity(
+        entity_id, disabled_by=er.RegistryEntryDisabler.USER
+    )
+    await hass.async_block_till_done()
+    await coordinator.async_refresh()
+
+    assert "Measurement.ChaSess.WhIn" not in requested_channels(
+        evcharger, URL_MEASUREMENTS
+    )
+
+
+async def test_update_failed_aggregates_errors(
+    hass: HomeAssistant, entry, evcharger
+) -> None:
+    """Test failures of concurrent requests are reported in a single error."""
+    coordinator = entry.runtime_data.coordinator
+    measurements_error = SmaEvChargerConnectionError("measurements failed")
+    parameters_error = SmaEvChargerConnectionError("parameters failed")
+
+    def request_json(method, url, data, headers=None):
+        if url == URL_MEASUREMENTS:
+            raise measurements_error
+        raise parameters_error
+
+    with (
+        patch.object(evcharger, "request_json", side_effect=request_json),
+        pytest.raises(UpdateFailed) as exc_info,
+    ):
+        await coordinator._async_update_data()
+
+    assert isinstance(exc_info.value.__cause__, ExceptionGroup)
+    assert exc_info.value.__cause__.exceptions == (
+        measurements_error,
+        parameters_error,
+    )
+
+
+async def test_circuit_breaker(hass: HomeAssistant, entry, evcharger) -> None:
+    """Test an unreachable charger is backed off from and probed."""
+    coordinator = entry.runtime_data.coordinator
+    request_calls = evcharger.request_json.call_count
+
+    with patch.object(
+        evcharger, "request_json", side_effect=SmaEvChargerConnectionError
+    ) as mock:
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            await coordinator.async_refresh()
+        assert coordinator.breaker.state is CircuitState.OPEN
+        assert coordinator.last_exception.retry_after == BREAKER_MIN_BACKOFF
+        # The next refresh probes the device once the backoff passed.
+        assert coordinator.next_refresh() == coordinator.breaker.open_until
+        failed_calls = mock.call_count
+
+        # No requests are sent while the circuit is open.
+        await coordinator.async_refresh()
+        assert mock.call_count == failed_calls
+        assert not coordinator.last_update_success
+
+    # The probe succeeds once the backoff passed.
+    coordinator.breaker._open_until = 0.0
+    await coordinator.async_refresh()
+    assert evcharger.request_json.call_count > request_calls
+    assert coordinator.last_update_success
+    assert coordinator.breaker.state is CircuitState.CLOSED
+
+
+@pytest.mark.parametrize(
+    "error",
+    [ClientResponseError(Mock(), (), status=503), TimeoutError()],
+)
+async def test_request_errors_counted(
+    hass: HomeAssistant, entry, evcharger, error: Exception
+) -> None:
+    """Test HTTP errors and timeouts fail the update and count for the breaker."""
+    coordinator = entry.runtime_data.coordinator
+
+    with patch.object(evcharger, "request_json", side_effect=error):
+        await coordinator.async_refresh()
+
+    assert isinstance(coordinator.last_exception, UpdateFailed)
+    assert coordinator.breaker.failures == 1
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_auth_failure_starts_reauth(hass: HomeAssistant, entry) -> None:
+    """Test rejected credentials start a reauthentication which resumes polling."""
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = entry.runtime_data.coordinator
+    entry.runtime_data.evcharger.is_closed = True
+
+    with patch.object(
+        MockSmaEvCharger,
+        "request_token",
+        AsyncMock(side_effect=SmaEvChargerAuthenticationError),
+    ):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert not coordinator.last_update_success
+    assert coordinator.breaker.failures == 0
+    flows = entry.async_get_active_flows(hass, {SOURCE_REAUTH})
+    assert len(flows) == 1
+    assert flows[0]["step_id"] == "reauth_confirm"
+
+    result = await hass.config_entries.flow.async_configure(
+        flows[0]["flow_id"],
+        {CONF_USERNAME: "Test", CONF_PASSWORD: "Tester5678&"},
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "reauth_successful"
+    assert entry.data[CONF_PASSWORD] == "Tester5678&"
+    assert entry.state is ConfigEntryState.LOADED
+    coordinator = entry.runtime_data.coordinator
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_adaptive_polling(hass: HomeAssistant) -> None:
+    """Test the update interval follows the charging state."""
+    entry = MockConfigEntry(
+        domain=smaev.DOMAIN,
+        title=CONFIG_DATA["host"],
+        unique_id="1234567890",
+        data=CONFIG_DATA,
+        options={CONF_ADAPTIVE_POLLING: True, CONF_IDLE_SCAN_INTERVAL: 300},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = entry.runtime_data.coordinator
+
+    # Vehicle connected (sleep mode)
+    await coordinator.async_refresh()
+    assert coordinator.vehicle_connected
+    assert coordinator.update_interval == timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+
+    def request_json(method, url, data, headers=None):
+        result = mock_request_json(method, url, data, headers)
+        if url == URL_MEASUREMENTS:
+            result = [
+                {
+                    **channel,
+                    "values": [{"value": SmaEvChargerMeasurements.NOT_CONNECTED}],
+                }
+                if channel["channelId"] == SMAEV_CHARGING_STATE_CHANNEL
+                else channel
+                for channel in result
+            ]
+        return result
+
+    with patch.object(coordinator.evcharger, "request_json", side_effect=request_json):
+        # State change keeps polling fast for a while.
+        await coordinator.async_refresh()
+        assert not coordinator.vehicle_connected
+        assert coordinator.update_interval == timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+
+        # Back off once the fast polling period is over.
+        coordinator._fast_polling_until = 0.0
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=300)
+
+        # A parameter write switches back to fast polling.
+        await coordinator.async_set_parameter("Parameter.Chrg.ActChaMod", "4718")
+        assert coordinator.update_interval == timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+
+        # The refresh scheduled with the idle interval was moved up.
+        polls = request_count(coordinator.evcharger, URL_MEASUREMENTS)
+        async_fire_time_changed(
+            hass, utcnow() + timedelta(seconds=DEFAULT_SCAN_INTERVAL + 0.1)
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+        assert request_count(coordinator.evcharger, URL_MEASUREMENTS) == polls + 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
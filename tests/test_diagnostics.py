@@ -0,0 +1,33 @@
+"""Test the SMA EV Charger diagnostics."""
+
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.core import HomeAssistant
+
+from custom_components.smaev.diagnostics import async_get_config_entry_diagnostics
+from custom_components.smaev.stats import ENDPOINT_MEASUREMENTS, ENDPOINT_PARAMETERS
+
+
+async def test_diagnostics(hass: HomeAssistant, entry, evcharger) -> None:
+    """Test the diagnostics are redacted and contain the statistics."""
+    coordinator = entry.runtime_data.coordinator
+    await coordinator.async_refresh()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"]["host"] == REDACTED
+    assert diagnostics["entry"]["data"]["password"] == REDACTED
+    assert diagnostics["device_info"]["identifiers"] == REDACTED
+    assert diagnostics["device_info"]["sw_version"] == "1.2.23.R"
+    assert diagnostics["channels"] == entry.runtime_data.channels
+    assert diagnostics["coordinator"]["breaker"]["state"] == "closed"
+
+    statistics = diagnostics["statistics"]
+    for endpoint in (ENDPOINT_MEASUREMENTS, ENDPOINT_PARAMETERS):
+        assert statistics["requests"][endpoint]["count"] == 1
+        assert statistics["requests"][endpoint]["failures"] == 0
+        assert set(statistics["requests"][endpoint]["latency_ms"]) == {
+            "p50",
+            "p90",
+            "p99",
+        }
+    assert statistics["entity_updates"]["count"] > 0
@@ -1,17 +1,17 @@
 """Test init of SMA EV Charger integration."""
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pysmaev.core
 import pysmaev.exceptions
 import pytest
 from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components import smaev
 
-from .conftest import CONFIG_DATA, MockSmaEvCharger
+from .conftest import PARAMETERS, MockSmaEvCharger
 
 
 @patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
@@ -33,19 +33,61 @@ async def test_async_setup_entry(hass: HomeAssistant, entry) -> None:
 
 
 @patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
-async def test_async_setup_multiple_entries(hass: HomeAssistant) -> None:
-    """Test a successful setup entry and unload of entry."""
-    entries = [
-        MockConfigEntry(
-            domain=smaev.DOMAIN,
-            title=host,
-            unique_id=f"123456789{idx}",
-            data={**CONFIG_DATA, "host": host},
-            options={},
-        )
-        for idx, host in enumerate(("192.168.2.100", "192.168.2.101"))
+async def test_read_only_account(hass: HomeAssistant, entry) -> None:
+    """Test control platforms are not set up if no parameter may be written."""
+    read_only = [
+        {
+            **component,
+            "values": [
+                {**channel, "editable": False} for channel in component["values"]
+            ],
+        }
+        for component in PARAMETERS
     ]
+    entry.add_to_hass(hass)
+    with patch.object(
+        MockSmaEvCharger, "request_parameters", AsyncMock(return_value=read_only)
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.runtime_data.platforms == [Platform.SENSOR]
+    assert not entry.runtime_data.writable_channels
+    assert hass.states.get("sensor.smaev_1234567890_charging_session_energy")
+    for platform in (
+        Platform.DATETIME,
+        Platform.NUMBER,
+        Platform.SELECT,
+        Platform.SWITCH,
+    ):
+        assert not hass.states.async_entity_ids(platform)
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.state == ConfigEntryState.NOT_LOADED
 
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_connection_pool_per_entry(hass: HomeAssistant, entries) -> None:
+    """Test each charger gets its own connection pool closed on unload."""
+    for entry in entries:
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    sessions = [entry.runtime_data.evcharger.session for entry in entries]
+    assert sessions[0] is not sessions[1]
+    assert sessions[0].connector is not sessions[1].connector
+
+    for entry, session in zip(entries, sessions, strict=True):
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        assert session.closed
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_async_setup_multiple_entries(hass: HomeAssistant, entries) -> None:
+    """Test a successful setup entry and unload of entry."""
     for entry in entries:
         entry.add_to_hass(hass)
         assert await hass.config_entries.async_setup(entry.entry_id)
@@ -64,21 +106,27 @@ async def test_async_setup_multiple_entries(hass: HomeAssistant) -> None:
 
 
 @pytest.mark.parametrize(
-    "error",
+    ("error", "state"),
     [
-        pysmaev.exceptions.SmaEvChargerConnectionError,
-        pysmaev.exceptions.SmaEvChargerAuthenticationError,
+        (
+            pysmaev.exceptions.SmaEvChargerConnectionError,
+            ConfigEntryState.SETUP_RETRY,
+        ),
+        (
+            pysmaev.exceptions.SmaEvChargerAuthenticationError,
+            ConfigEntryState.SETUP_ERROR,
+        ),
     ],
 )
-@patch.object(smaev, "async_get_clientsession", AsyncMock)
+@patch.object(smaev, "async_create_evcharger_session", Mock(return_value=AsyncMock()))
 async def test_async_setup_entry_raises_error(
-    hass: HomeAssistant, entry, error
+    hass: HomeAssistant, entry, error, state
 ) -> None:
-    """Test that an authentication error is handled properly."""
+    """Test that connection and authentication errors are handled properly."""
     entry.add_to_hass(hass)
 
-    with patch.object(pysmaev.core.SmaEvCharger, "open", side_effekt=error):
+    with patch.object(pysmaev.core.SmaEvCharger, "request_token", side_effect=error):
         await hass.config_entries.async_setup(entry.entry_id)
         await hass.async_block_till_done()
 
-    assert entry.state == ConfigEntryState.SETUP_ERROR
+    assert entry.state == state
@@ -0,0 +1,99 @@
+"""Test the metrics of the SMA EV Charger integration."""
+
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pysmaev.core
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from custom_components import smaev
+from custom_components.smaev.const import CONF_METRICS
+from custom_components.smaev.metrics import (
+    COUNT_BUCKETS,
+    Histogram,
+    SmaEvChargerMetrics,
+    render_metrics,
+)
+from custom_components.smaev.stats import ENDPOINT_MEASUREMENTS
+
+from .conftest import CONFIG_DATA, MockSmaEvCharger
+
+
+def test_histogram() -> None:
+    """Test observed values are counted in all buckets they fit in."""
+    histogram = Histogram((1, 2, 5))
+    for value in (0.5, 2, 3, 10):
+        histogram.observe(value)
+
+    assert histogram.bucket_counts == [1, 2, 3]
+    assert histogram.count == 4
+    assert histogram.sum == 15.5
+
+
+def test_render_metrics() -> None:
+    """Test the metrics are rendered in the exposition format."""
+    metrics = SmaEvChargerMetrics()
+    metrics.request_duration[ENDPOINT_MEASUREMENTS].observe(0.02)
+    metrics.request_failures[ENDPOINT_MEASUREMENTS] += 1
+    metrics.entity_writes.observe(3)
+
+    lines = render_metrics([("1234567890", metrics)]).splitlines()
+
+    assert "# TYPE smaev_request_duration_seconds histogram" in lines
+    assert (
+        'smaev_request_duration_seconds_bucket{serial="1234567890",'
+        'endpoint="request_measurements",le="0.025"} 1'
+    ) in lines
+    assert (
+        'smaev_request_duration_seconds_bucket{serial="1234567890",'
+        'endpoint="request_measurements",le="0.01"} 0'
+    ) in lines
+    assert (
+        'smaev_request_failures_total{serial="1234567890",'
+        'endpoint="request_measurements"} 1'
+    ) in lines
+    assert 'smaev_entity_writes_per_refresh_count{serial="1234567890"} 1' in lines
+    assert len(metrics.entity_writes.bucket_counts) == len(COUNT_BUCKETS)
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_metrics_view(
+    hass: HomeAssistant, hass_client: ClientSessionGenerator
+) -> None:
+    """Test the metrics are recorded and exposed if enabled."""
+    assert await async_setup_component(hass, "http", {})
+    entry = MockConfigEntry(
+        domain=smaev.DOMAIN,
+        title=CONFIG_DATA["host"],
+        unique_id="1234567890",
+        data=CONFIG_DATA,
+        options={CONF_METRICS: True},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = entry.runtime_data.coordinator
+    await coordinator.async_refresh()
+
+    metrics = coordinator.stats.metrics
+    assert metrics is not None
+    assert metrics.refresh_duration.count == 1
+    assert metrics.request_duration[ENDPOINT_MEASUREMENTS].count == 1
+    assert metrics.entity_writes.count == 1
+    assert metrics.entity_writes.sum > 0
+
+    client = await hass_client()
+    response = await client.get("/api/smaev/metrics")
+    assert response.status == HTTPStatus.OK
+    body = await response.text()
+    assert 'smaev_refresh_duration_seconds_count{serial="1234567890"} 1' in body
+
+    # Disabling the metrics drops the recorded values.
+    hass.config_entries.async_update_entry(entry, options={CONF_METRICS: False})
+    await hass.async_block_till_done()
+    assert coordinator.stats.metrics is None
+    response = await client.get("/api/smaev/metrics")
+    assert response.status == HTTPStatus.NOT_FOUND
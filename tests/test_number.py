@@ -1,11 +1,14 @@
 """Test for the SMA EV Charger number platform."""
 
+from homeassistant.components.number import ATTR_MAX, ATTR_MIN
 from homeassistant.const import (
     ATTR_DEVICE_CLASS,
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_STATE_CHANGED,
     STATE_UNKNOWN,
 )
 from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_capture_events
 
 from custom_components.smaev import generate_smaev_entity_id
 from custom_components.smaev.number import ENTITY_ID_FORMAT, NUMBER_DESCRIPTIONS
@@ -28,3 +31,26 @@ async def test_setup_smaev_number(hass: HomeAssistant, entry, evcharger):
             == description.native_unit_of_measurement
         )
         assert state.attributes.get(ATTR_DEVICE_CLASS) == description.device_class
+
+
+async def test_bounds_and_value_written_once(hass: HomeAssistant, entry, evcharger):
+    """Test new bounds and the value are written in a single state."""
+    description = next(
+        description
+        for description in NUMBER_DESCRIPTIONS
+        if description.channel == "Parameter.Chrg.StpWhenFlTm"
+    )
+    entity_id = generate_smaev_entity_id(
+        hass, entry, ENTITY_ID_FORMAT, description, suffix=False
+    )
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    await entry.runtime_data.coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    changes = [event for event in events if event.data["entity_id"] == entity_id]
+    assert len(changes) == 1
+    state = changes[0].data["new_state"]
+    assert state.state == "15"
+    assert state.attributes[ATTR_MIN] == 5
+    assert state.attributes[ATTR_MAX] == 1440
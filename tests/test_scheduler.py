@@ -0,0 +1,85 @@
+"""Test the update scheduling of the SMA EV Charger integration."""
+
+import asyncio
+from unittest.mock import patch
+
+import pysmaev.core
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.smaev.const import DEFAULT_SCAN_INTERVAL
+from custom_components.smaev.scheduler import SmaEvChargerScheduler, next_slot
+
+from .conftest import MockSmaEvCharger, mock_request_json
+
+
+@pytest.mark.parametrize(
+    ("now", "offset", "slot"),
+    [
+        (0.0, 0.0, 5.0),
+        (5.1, 0.0, 10.0),
+        (7.4, 0.0, 10.0),
+        (7.6, 0.0, 10.0),
+        (10.0, 0.0, 15.0),
+        (5.1, 2.5, 7.5),
+    ],
+)
+def test_next_slot(now: float, offset: float, slot: float) -> None:
+    """Test the next slot is the first one after now."""
+    assert next_slot(now, 5.0, offset) == pytest.approx(slot)
+
+
+def test_offsets_spread_evenly() -> None:
+    """Test the slots of the chargers are spread evenly across the interval."""
+    scheduler = SmaEvChargerScheduler(1)
+    unregister = [scheduler.async_register(entry_id) for entry_id in "abc"]
+    assert [scheduler.offset(entry_id, 6.0) for entry_id in "abc"] == [0, 2, 4]
+
+    unregister[1]()
+    assert [scheduler.offset(entry_id, 6.0) for entry_id in "ac"] == [0, 3]
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_refreshes_staggered(hass: HomeAssistant, entries) -> None:
+    """Test the refreshes of several chargers are scheduled in their slots."""
+    for entry in entries:
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    for index, entry in enumerate(entries):
+        coordinator = entry.runtime_data.coordinator
+        next_refresh = coordinator.next_refresh()
+        assert 0 < next_refresh - hass.loop.time() <= DEFAULT_SCAN_INTERVAL
+        slots = (
+            next_refresh - index * DEFAULT_SCAN_INTERVAL / len(entries)
+        ) / DEFAULT_SCAN_INTERVAL
+        assert slots == pytest.approx(round(slots))
+
+    for entry in entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+
+async def test_requests_capped(hass: HomeAssistant, entry, evcharger) -> None:
+    """Test the number of requests in flight is capped."""
+    coordinator = entry.runtime_data.coordinator
+    in_flight = 0
+    max_in_flight = 0
+
+    async def request_json(method, url, data, headers=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return mock_request_json(method, url, data, headers)
+
+    with (
+        patch.object(coordinator.scheduler, "request_semaphore", asyncio.Semaphore(1)),
+        patch.object(evcharger, "request_json", side_effect=request_json),
+    ):
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert max_in_flight == 1
@@ -1,7 +1,9 @@
 """Test for the SMA EV Charger select platform."""
 
-from homeassistant.const import STATE_UNKNOWN
+from homeassistant.components.select import ATTR_OPTIONS
+from homeassistant.const import EVENT_STATE_CHANGED, STATE_UNKNOWN
 from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_capture_events
 
 from custom_components.smaev import generate_smaev_entity_id
 from custom_components.smaev.select import ENTITY_ID_FORMAT, SELECT_DESCRIPTIONS
@@ -19,3 +21,21 @@ async def test_setup_smaev_select(hass: HomeAssistant, entry, evcharger):
         state = hass.states.get(entity_id)
         assert state is not None
         assert state.state == STATE_UNKNOWN
+
+
+async def test_options_and_option_written_once(hass: HomeAssistant, entry, evcharger):
+    """Test new options and the current option are written in a single state."""
+    description = SELECT_DESCRIPTIONS[0]
+    entity_id = generate_smaev_entity_id(
+        hass, entry, ENTITY_ID_FORMAT, description, suffix=False
+    )
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    await entry.runtime_data.coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    changes = [event for event in events if event.data["entity_id"] == entity_id]
+    assert len(changes) == 1
+    state = changes[0].data["new_state"]
+    assert state.state == "charge_stop"
+    assert state.attributes[ATTR_OPTIONS] == ["boost_charging", "charge_stop"]
@@ -1,6 +1,6 @@
 """Test for the SMA EV Charger sensor platform."""
 
-from datetime import timedelta
+from unittest.mock import patch
 
 from homeassistant.const import (
     ATTR_DEVICE_CLASS,
@@ -10,13 +10,15 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
-from homeassistant.util.dt import utcnow
+from pysmaev.const import URL_MEASUREMENTS
 from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
 from custom_components.smaev import generate_smaev_entity_id
-from custom_components.smaev.const import DEFAULT_SCAN_INTERVAL
+from custom_components.smaev.const import SMAEV_MEASUREMENT
 from custom_components.smaev.sensor import ENTITY_ID_FORMAT, SENSOR_DESCRIPTIONS
 
+from .conftest import mock_request_json, next_refresh, request_count
+
 
 def get_entity_ids_and_descriptions(hass, entry) -> tuple:
     """Return a list with (entity_id, entity_description)."""
@@ -61,10 +63,8 @@ async def test_status_change(
 ) -> None:
     """Test sensor changes its state on coordinator update."""
     # Make the coordinator refresh data.
-    async_fire_time_changed(
-        hass, utcnow() + timedelta(seconds=DEFAULT_SCAN_INTERVAL + 1)
-    )
-    await hass.async_block_till_done()
+    async_fire_time_changed(hass, next_refresh(hass, entry.runtime_data.coordinator))
+    await hass.async_block_till_done(wait_background_tasks=True)
 
     for entity_id, description in get_entity_ids_and_descriptions(hass, entry):
         value = channel_values[description.channel]
@@ -81,3 +81,56 @@ async def test_unload_config_entry(hass: HomeAssistant, entry, evcharger) -> Non
 
     for entity_id, _ in items:
         assert hass.states.get(entity_id).state == STATE_UNAVAILABLE
+
+
+async def test_unchanged_state_not_written(
+    hass: HomeAssistant, entry, evcharger
+) -> None:
+    """Test the state is not written again if the channel data is unchanged."""
+    coordinator = entry.runtime_data.coordinator
+    for _ in range(2):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    items = get_entity_ids_and_descriptions(hass, entry)
+    states = {entity_id: hass.states.get(entity_id) for entity_id, _ in items}
+    polls = request_count(evcharger, URL_MEASUREMENTS)
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.last_update_success
+    assert request_count(evcharger, URL_MEASUREMENTS) == polls + 1
+    for entity_id, _ in items:
+        state = hass.states.get(entity_id)
+        assert state.last_updated == states[entity_id].last_updated
+        assert state.last_reported == states[entity_id].last_reported
+
+
+async def test_undecodable_value_unknown(hass: HomeAssistant, entry, evcharger) -> None:
+    """Test a sensor reports unknown instead of a stale value if decoding fails."""
+    coordinator = entry.runtime_data.coordinator
+    await coordinator.async_refresh()
+    entity_id, description = next(
+        (entity_id, description)
+        for entity_id, description in get_entity_ids_and_descriptions(hass, entry)
+        if description.type == SMAEV_MEASUREMENT
+    )
+    assert hass.states.get(entity_id).state != STATE_UNKNOWN
+
+    def request_json(method, url, data, headers=None):
+        result = mock_request_json(method, url, data, headers)
+        if url == URL_MEASUREMENTS:
+            result = [
+                {**channel, "values": [{"value": "invalid"}]}
+                if channel["channelId"] == description.channel
+                else channel
+                for channel in result
+            ]
+        return result
+
+    with patch.object(evcharger, "request_json", side_effect=request_json):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert hass.states.get(entity_id).state == STATE_UNKNOWN
@@ -0,0 +1,112 @@
+"""Test the SMA EV Charger services."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import CONF_DEVICE_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+from pysmaev.const import URL_PARAMETERS
+from pysmaev.exceptions import SmaEvChargerConnectionError
+
+from custom_components.smaev.const import (
+    ATTR_PARAMETERS,
+    DOMAIN,
+    SERVICE_SET_PARAMETERS,
+)
+
+from .conftest import DEVICE_INFO, stateful_request_json
+
+
+async def test_set_parameters(
+    hass: HomeAssistant, device_registry: dr.DeviceRegistry, entry, evcharger
+) -> None:
+    """Test several parameters are written with a single request."""
+    coordinator = entry.runtime_data.coordinator
+    await coordinator.async_refresh()
+    device = device_registry.async_get_device(
+        identifiers={(DOMAIN, DEVICE_INFO["serial"])}
+    )
+    parameters = {
+        "Parameter.Chrg.Plan.En": "12",
+        "Parameter.Chrg.Plan.DurTmm": "240",
+    }
+
+    with patch.object(
+        evcharger, "request_json", side_effect=stateful_request_json({})
+    ) as mock:
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_PARAMETERS,
+            {CONF_DEVICE_ID: device.id, ATTR_PARAMETERS: parameters},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert response == {
+        ATTR_PARAMETERS: {channel_id: {"success": True} for channel_id in parameters}
+    }
+    writes = [call for call in mock.call_args_list if call.args[0] == "PUT"]
+    assert len(writes) == 1
+    assert {
+        channel["channelId"]: channel["value"]
+        for channel in json.loads(writes[0].args[2])["values"]
+    } == parameters
+    reads = [call for call in mock.call_args_list if call.args[1] == URL_PARAMETERS]
+    assert len(reads) == 1
+    for channel_id, value in parameters.items():
+        assert coordinator.data.parameters[channel_id].value == value
+
+
+async def test_set_parameters_read_only(
+    hass: HomeAssistant, device_registry: dr.DeviceRegistry, entry, evcharger
+) -> None:
+    """Test unknown and read-only parameters are rejected before writing."""
+    device = device_registry.async_get_device(
+        identifiers={(DOMAIN, DEVICE_INFO["serial"])}
+    )
+    parameters = {
+        "Parameter.Chrg.Plan.En": "12",
+        "Parameter.Nameplate.SerNum": "0",
+        "Parameter.Unknown": "1",
+    }
+
+    with (
+        patch.object(evcharger, "request_json") as mock,
+        pytest.raises(ServiceValidationError, match="Parameter.Nameplate.SerNum"),
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_PARAMETERS,
+            {CONF_DEVICE_ID: device.id, ATTR_PARAMETERS: parameters},
+            blocking=True,
+        )
+
+    mock.assert_not_called()
+
+
+async def test_set_parameters_failed(
+    hass: HomeAssistant, device_registry: dr.DeviceRegistry, entry, evcharger
+) -> None:
+    """Test a failed write is raised as a Home Assistant error."""
+    device = device_registry.async_get_device(
+        identifiers={(DOMAIN, DEVICE_INFO["serial"])}
+    )
+
+    with (
+        patch.object(
+            evcharger, "request_json", side_effect=SmaEvChargerConnectionError
+        ),
+        pytest.raises(HomeAssistantError, match="Could not write parameters"),
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_PARAMETERS,
+            {
+                CONF_DEVICE_ID: device.id,
+                ATTR_PARAMETERS: {"Parameter.Chrg.Plan.En": "12"},
+            },
+            blocking=True,
+        )
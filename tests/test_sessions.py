@@ -0,0 +1,268 @@
+"""Test the charging session tracking of the SMA EV Charger integration."""
+
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pysmaev.core
+import pytest
+import voluptuous as vol
+from homeassistant.components.recorder import Recorder, get_instance
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.const import CONF_DEVICE_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from pysmaev.const import SmaEvChargerMeasurements
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components import smaev
+from custom_components.smaev.const import (
+    ATTR_LIMIT,
+    ATTR_SESSIONS,
+    CONF_SESSION_STATISTICS,
+    SERVICE_GET_CHARGING_SESSIONS,
+    SESSION_HISTORY_SIZE,
+    SMAEV_CHARGE_MODE_CHANNEL,
+    SMAEV_CHARGING_STATE_CHANNEL,
+    SMAEV_METER_READING_CHANNEL,
+    SMAEV_POWER_CHANNEL,
+    SMAEV_SESSION_ENERGY_CHANNEL,
+)
+from custom_components.smaev.sensor import LAST_SESSION_DESCRIPTION
+from custom_components.smaev.sessions import SessionSummary, SmaEvChargerSessionTracker
+from custom_components.smaev.snapshot import MeasurementChannel
+
+from .conftest import CONFIG_DATA, DEVICE_INFO, MockSmaEvCharger
+
+SESSIONS_KEY = f"smaev.{DEVICE_INFO['serial']}.sessions"
+
+LAST_SESSION_ENTITY_ID = (
+    f"sensor.smaev_{DEVICE_INFO['serial']}_{LAST_SESSION_DESCRIPTION.key}"
+)
+
+
+def measurements(
+    charging_state: int,
+    session_energy: float,
+    meter_reading: float,
+    power: float = 0,
+    charge_mode: int = SmaEvChargerMeasurements.BOOST_CHARGING,
+) -> dict[str, MeasurementChannel]:
+    """Return the measurements of the session channels."""
+    return {
+        SMAEV_CHARGING_STATE_CHANNEL: MeasurementChannel(charging_state),
+        SMAEV_SESSION_ENERGY_CHANNEL: MeasurementChannel(session_energy),
+        SMAEV_METER_READING_CHANNEL: MeasurementChannel(meter_reading),
+        SMAEV_POWER_CHANNEL: MeasurementChannel(power),
+        SMAEV_CHARGE_MODE_CHANNEL: MeasurementChannel(charge_mode),
+    }
+
+
+UPDATES = [
+    (
+        datetime(2024, 2, 16, 10, 5, tzinfo=UTC),
+        measurements(SmaEvChargerMeasurements.NOT_CONNECTED, 0, 1000),
+    ),
+    (
+        datetime(2024, 2, 16, 10, 10, tzinfo=UTC),
+        measurements(SmaEvChargerMeasurements.ACTIVE_MODE, 0, 1000, 11000),
+    ),
+    (
+        datetime(2024, 2, 16, 10, 55, tzinfo=UTC),
+        measurements(SmaEvChargerMeasurements.SLEEP_MODE, 5000, 6000),
+    ),
+    (
+        datetime(2024, 2, 16, 11, 5, tzinfo=UTC),
+        measurements(SmaEvChargerMeasurements.NOT_CONNECTED, 0, 6000),
+    ),
+]
+
+SESSION = SessionSummary(
+    start=datetime(2024, 2, 16, 10, 10, tzinfo=UTC),
+    end=datetime(2024, 2, 16, 11, 5, tzinfo=UTC),
+    energy=5000,
+    peak_power=11000,
+    # 11 kW for 45 of 55 minutes
+    average_power=9000,
+    charge_mode="boost_charging",
+)
+
+
+async def test_session_tracked(hass: HomeAssistant, entry) -> None:
+    """Test a session lasts from connecting a vehicle until disconnecting it."""
+    tracker = SmaEvChargerSessionTracker(hass, entry)
+    for now, update in UPDATES[:3]:
+        tracker.async_update(update, now)
+
+    assert tracker.session is not None
+    assert tracker.session.start == SESSION.start
+    assert tracker.session.energy == 5000
+    assert tracker.session.peak_power == 11000
+    assert tracker.last_session is None
+
+    tracker.async_update(UPDATES[3][1], UPDATES[3][0])
+
+    assert tracker.session is None
+    # The energy counter reset on disconnecting is not taken over.
+    assert tracker.last_session == SESSION
+
+
+@patch.object(pysmaev.core, "SmaEvCharger", MockSmaEvCharger)
+async def test_sessions_restored(
+    hass: HomeAssistant, entity_registry: er.EntityRegistry, hass_storage
+) -> None:
+    """Test the sessions are restored and returned by the last session sensor."""
+    # The last session sensor is disabled by default.
+    entity_registry.async_get_or_create(
+        SENSOR_DOMAIN,
+        smaev.DOMAIN,
+        f"{DEVICE_INFO['serial']}-{LAST_SESSION_DESCRIPTION.key}",
+        suggested_object_id=LAST_SESSION_ENTITY_ID.split(".")[1],
+        disabled_by=None,
+    )
+    hass_storage[SESSIONS_KEY] = {
+        "version": 1,
+        "key": SESSIONS_KEY,
+        "data": [SESSION.as_dict()],
+    }
+    entry = MockConfigEntry(
+        domain=smaev.DOMAIN,
+        title=CONFIG_DATA["host"],
+        unique_id=DEVICE_INFO["serial"],
+        data=CONFIG_DATA,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    await entry.runtime_data.coordinator.async_refresh()
+
+    state = hass.states.get(LAST_SESSION_ENTITY_ID)
+    assert state is not None
+    assert state.state == SESSION.end.isoformat()
+    assert state.attributes["energy"] == 5000
+    assert state.attributes["average_power"] == 9000
+    assert state.attributes["charge_mode"] == "boost_charging"
+
+    # The sessions are tracked for the sensor without importing statistics.
+    coordinator = entry.runtime_data.coordinator
+    assert coordinator._session_tracking == 1
+    assert not coordinator.sessions.import_statistics
+
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_SESSION_STATISTICS: True}
+    )
+    await hass.async_block_till_done()
+    assert coordinator._session_tracking == 2
+    assert coordinator.sessions.import_statistics
+
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_SESSION_STATISTICS: False}
+    )
+    await hass.async_block_till_done()
+    assert coordinator._session_tracking == 1
+    state = hass.states.get(LAST_SESSION_ENTITY_ID)
+    assert state is not None
+    assert state.state == SESSION.end.isoformat()
+
+    assert await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert SESSIONS_KEY not in hass_storage
+
+
+async def test_get_charging_sessions(
+    hass: HomeAssistant, device_registry: dr.DeviceRegistry, entry, evcharger
+) -> None:
+    """Test the finished sessions are returned, the latest first."""
+    tracker = entry.runtime_data.coordinator.sessions
+    for now, update in UPDATES:
+        tracker.async_update(update, now)
+    for now, update in UPDATES:
+        tracker.async_update(update, now + timedelta(days=1))
+    device = device_registry.async_get_device(
+        identifiers={(smaev.DOMAIN, DEVICE_INFO["serial"])}
+    )
+
+    response = await hass.services.async_call(
+        smaev.DOMAIN,
+        SERVICE_GET_CHARGING_SESSIONS,
+        {CONF_DEVICE_ID: device.id, ATTR_LIMIT: 1},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {
+        ATTR_SESSIONS: [
+            replace(
+                SESSION,
+                start=SESSION.start + timedelta(days=1),
+                end=SESSION.end + timedelta(days=1),
+            ).as_dict()
+        ]
+    }
+
+    # No more sessions than kept in the history can be requested.
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            smaev.DOMAIN,
+            SERVICE_GET_CHARGING_SESSIONS,
+            {CONF_DEVICE_ID: device.id, ATTR_LIMIT: SESSION_HISTORY_SIZE + 1},
+            blocking=True,
+            return_response=True,
+        )
+
+
+async def test_statistics_imported(
+    recorder_mock: Recorder, hass: HomeAssistant, entry
+) -> None:
+    """Test the session energy and the hourly meter reading are imported."""
+    entry.add_to_hass(hass)
+    tracker = SmaEvChargerSessionTracker(hass, entry)
+    tracker.import_statistics = True
+    for now, update in UPDATES:
+        tracker.async_update(update, now)
+        await hass.async_block_till_done(wait_background_tasks=True)
+    # A second session ending in the same hour.
+    for now, update in (
+        (
+            datetime(2024, 2, 16, 11, 10, tzinfo=UTC),
+            measurements(SmaEvChargerMeasurements.ACTIVE_MODE, 0, 6000, 11000),
+        ),
+        (
+            datetime(2024, 2, 16, 11, 25, tzinfo=UTC),
+            measurements(SmaEvChargerMeasurements.SLEEP_MODE, 2000, 8000),
+        ),
+        (
+            datetime(2024, 2, 16, 11, 30, tzinfo=UTC),
+            measurements(SmaEvChargerMeasurements.NOT_CONNECTED, 0, 8000),
+        ),
+    ):
+        tracker.async_update(update, now)
+        await hass.async_block_till_done(wait_background_tasks=True)
+    await async_wait_recording_done(hass)
+
+    session_energy = tracker.session_energy_metadata["statistic_id"]
+    charged_energy = tracker.charged_energy_metadata["statistic_id"]
+    assert session_energy == "smaev:1234567890_session_energy"
+    statistics = await get_instance(hass).async_add_executor_job(
+        statistics_during_period,
+        hass,
+        datetime(2024, 2, 16, tzinfo=UTC),
+        None,
+        {session_energy, charged_energy},
+        "hour",
+        None,
+        {"state", "sum"},
+    )
+
+    assert [
+        (row["start"], row["state"], row["sum"]) for row in statistics[session_energy]
+    ] == [(datetime(2024, 2, 16, 11, tzinfo=UTC).timestamp(), 7000, 7000)]
+    # The sum starts from the first meter reading instead of the lifetime energy.
+    assert [
+        (row["start"], row["state"], row["sum"]) for row in statistics[charged_energy]
+    ] == [(datetime(2024, 2, 16, 10, tzinfo=UTC).timestamp(), 6000, 5000)]
@@ -0,0 +1,65 @@
+"""Test the SMA EV Charger simulator against the pysmaev client."""
+
+import random
+
+import pytest
+from pysmaev.const import SmaEvChargerMeasurements
+from pysmaev.core import SmaEvCharger
+from pysmaev.exceptions import SmaEvChargerAuthenticationError
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from .simulator import (
+    CHARGING_CYCLE,
+    SESSION_ENERGY_CHANNEL,
+    SimulatedCharger,
+    SimulatorConfig,
+    create_app,
+)
+
+
+def test_charging_cycle() -> None:
+    """Test the session energy increases while charging and restarts."""
+    now = 0.0
+    charger = SimulatedCharger(
+        "9000000000", SimulatorConfig(), random.Random(0), lambda: now
+    )
+    charger._cycle_offset = 0
+
+    states = []
+    energy = []
+    for state, duration in CHARGING_CYCLE * 2:
+        now += duration / 2
+        charger.update()
+        assert charger.charging_state == state
+        states.append(state)
+        energy.append(
+            charger.measurements[SESSION_ENERGY_CHANNEL]["values"][0]["value"]
+        )
+        now += duration / 2
+
+    active = states.index(SmaEvChargerMeasurements.ACTIVE_MODE)
+    assert energy[active] > energy[active - 1]
+    assert energy[active + 1] > energy[active]
+    # A new session starts with the next vehicle.
+    assert energy[len(CHARGING_CYCLE) + 1] == 0
+
+
+async def test_client(aiohttp_client: ClientSessionGenerator) -> None:
+    """Test the pysmaev client against a simulated charger."""
+    charger = SimulatedCharger("9000000000", SimulatorConfig(), random.Random(0))
+    client = await aiohttp_client(create_app(charger))
+    url = str(client.make_url("")).rstrip("/")
+
+    evcharger = SmaEvCharger(client.session, url, "Test", "wrong")
+    with pytest.raises(SmaEvChargerAuthenticationError):
+        await evcharger.open()
+
+    evcharger = SmaEvCharger(client.session, url, "Test", "Tester1234&")
+    await evcharger.open()
+    device_info = await evcharger.device_info()
+    assert device_info["serial"] == "9000000000"
+    assert await evcharger.get_measurement_channels()
+
+    await evcharger.set_parameter("20.000", "Parameter.Inverter.AcALim")
+    assert charger.parameters["Parameter.Inverter.AcALim"]["value"] == "20.000"
+    await evcharger.close()
@@ -0,0 +1,26 @@
+"""Test the request statistics of the SMA EV Charger integration."""
+
+import pytest
+
+from custom_components.smaev.stats import SmaEvChargerStats, percentiles
+
+
+def test_percentiles() -> None:
+    """Test the nearest-rank percentiles."""
+    assert percentiles([]) is None
+    assert percentiles(range(1, 101)) == {"p50": 50, "p90": 90, "p99": 99}
+    assert percentiles([3.0]) == {"p50": 3.0, "p90": 3.0, "p99": 3.0}
+
+
+async def test_failures_counted() -> None:
+    """Test failed requests are timed and counted."""
+    stats = SmaEvChargerStats()
+    async with stats.async_time_request("endpoint"):
+        pass
+    with pytest.raises(ValueError):
+        async with stats.async_time_request("endpoint"):
+            raise ValueError
+
+    assert stats.requests["endpoint"].count == 2
+    assert stats.requests["endpoint"].failures == 1
+    assert len(stats.requests["endpoint"].durations) == 2